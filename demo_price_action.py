@@ -8,6 +8,7 @@ trades based on supply/demand zones and reversal patterns.
 
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 
 from stonkwise.market_structure import MarketStructureDetector, TrendType
@@ -48,12 +49,13 @@ def demo_market_structure():
     
     # Create uptrend data
     dates = [datetime.now() - timedelta(days=i) for i in range(20, 0, -1)]
+    step = np.arange(20, dtype=np.float64) * 0.5
     uptrend_data = pd.DataFrame({
-        'Open': [100 + i * 0.5 for i in range(20)],
-        'High': [101 + i * 0.5 for i in range(20)],
-        'Low': [99 + i * 0.5 for i in range(20)],
-        'Close': [100.5 + i * 0.5 for i in range(20)],
-        'Volume': [1000000] * 20,
+        'Open': 100 + step,
+        'High': 101 + step,
+        'Low': 99 + step,
+        'Close': 100.5 + step,
+        'Volume': np.full(20, 1_000_000),
     }, index=dates)
     
     detector = MarketStructureDetector(
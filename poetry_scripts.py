@@ -3,6 +3,7 @@ Poetry scripts for the stonkwise project.
 """
 
 import os
+import shutil
 import subprocess
 import sys
 from pathlib import Path
@@ -50,31 +51,13 @@ def run_clean():
     """Clean up temporary files."""
     print("Cleaning up temporary files...")
     # Clean up __pycache__ directories
-    for path in Path(".").glob("**/__pycache__"):
-        for file in path.glob("*"):
-            file.unlink()
-        path.rmdir()
-    
-    # Clean up .pytest_cache
-    if Path(".pytest_cache").exists():
-        for file in Path(".pytest_cache").glob("**/*"):
-            if file.is_file():
-                file.unlink()
-        for path in sorted(Path(".pytest_cache").glob("**/*"), key=lambda p: len(str(p)), reverse=True):
-            if path.is_dir():
-                path.rmdir()
-        Path(".pytest_cache").rmdir()
-    
-    # Clean up .mypy_cache
-    if Path(".mypy_cache").exists():
-        for file in Path(".mypy_cache").glob("**/*"):
-            if file.is_file():
-                file.unlink()
-        for path in sorted(Path(".mypy_cache").glob("**/*"), key=lambda p: len(str(p)), reverse=True):
-            if path.is_dir():
-                path.rmdir()
-        Path(".mypy_cache").rmdir()
-    
+    for path in Path(".").rglob("__pycache__"):
+        shutil.rmtree(path, ignore_errors=True)
+
+    # Clean up .pytest_cache and .mypy_cache
+    for cache_dir in (".pytest_cache", ".mypy_cache"):
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
     print("Cleanup complete.")
 
 
@@ -87,13 +70,37 @@ def run_example():
 
 
 def run_build():
-    """Run the build process (format, lint, test)."""
+    """Run the build process (format, lint, test).
+
+    Formatting rewrites files, so it runs first. The read-only checks (flake8,
+    mypy and pytest) then run concurrently. Set STONKWISE_SEQUENTIAL_BUILD=1 to
+    run them one after another instead, e.g. for readable output.
+    """
     print("Running build process...")
     try:
         run_format()
-        run_lint()
-        run_test()
+        if os.environ.get("STONKWISE_SEQUENTIAL_BUILD"):
+            run_lint()
+            run_test()
+        else:
+            _run_checks_in_parallel()
         print("Build successful!")
     except subprocess.CalledProcessError as e:
         print(f"Build failed: {e}")
         sys.exit(1)
+
+
+def _run_checks_in_parallel():
+    """Run flake8, mypy and pytest at the same time and fail if any of them fails."""
+    commands = [
+        ["flake8", "stonkwise", "tests"],
+        ["mypy", "stonkwise"],
+        ["pytest", "-xvs", "tests"],
+    ]
+    print(f"Running {', '.join(command[0] for command in commands)} in parallel...")
+    processes = [subprocess.Popen(command) for command in commands]
+    # Wait for every check before reporting so no process is left running
+    returncodes = [process.wait() for process in processes]
+    for command, returncode in zip(commands, returncodes):
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command)
@@ -0,0 +1,231 @@
+"""
+Click commands of the stonkwise command line interface.
+
+This module provides a CLI built with Click for analyzing and backtesting
+trading strategies on historical price data. It is imported by stonkwise.cli
+only when a command actually runs.
+"""
+
+import datetime
+from typing import Any, Optional, Tuple
+
+import click
+
+from stonkwise import __version__
+
+
+# Define common options as function decorators to avoid repetition
+def ticker_option(required: bool = True) -> callable:
+    return click.option(
+        "--ticker",
+        "-t",
+        multiple=True,
+        required=required,
+        help="Stock ticker symbol(s) (e.g., MSFT, AMZN)",
+    )
+
+
+def period_option() -> callable:
+    return click.option(
+        "--period",
+        "-p",
+        type=click.Choice(["day", "week", "4h"]),
+        default="day",
+        help="Time period for analysis (day, week, or 4 hours)",
+    )
+
+
+class IsoDate(click.ParamType):
+    """Click parameter type for YYYY-MM-DD dates, parsed with date.fromisoformat."""
+
+    name = "date"
+
+    def convert(self, value: Any, param: Optional[click.Parameter], ctx: Optional[click.Context]) -> datetime.datetime:
+        if isinstance(value, datetime.datetime):
+            return value
+        try:
+            # Midnight of the date, like click.DateTime with a date-only format
+            return datetime.datetime.combine(datetime.date.fromisoformat(value), datetime.time())
+        except ValueError:
+            self.fail(f"{value!r} is not a valid date (expected YYYY-MM-DD)", param, ctx)
+
+
+def date_options() -> callable:
+    def decorator(f: callable) -> callable:
+        # Dates are parsed once here and passed on as datetime objects
+        f = click.option(
+            "--start-date",
+            type=IsoDate(),
+            help="Start date for analysis (YYYY-MM-DD), defaults to 1 year ago",
+        )(f)
+        f = click.option(
+            "--end-date",
+            type=IsoDate(),
+            help="End date for analysis (YYYY-MM-DD), defaults to today",
+        )(f)
+        return f
+
+    return decorator
+
+
+def _parse_metrics(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> Tuple[str, ...]:
+    """Split a comma-separated --metrics value into metric names, all of them if not given."""
+    from stonkwise.backtester import METRICS
+
+    if value is None:
+        return METRICS
+    metrics = tuple(name.strip() for name in value.split(",") if name.strip())
+    unknown = [name for name in metrics if name not in METRICS]
+    if unknown:
+        raise click.BadParameter(f"unknown metric(s) {', '.join(unknown)}; choose from {', '.join(METRICS)}")
+    return metrics
+
+
+def input_output_options():
+    def decorator(f):
+        f = click.option(
+            "--input-file",
+            type=click.Path(exists=True, readable=True),
+            help="Path to input CSV or Parquet file (instead of Yahoo Finance)",
+        )(f)
+        f = click.option(
+            "--output",
+            type=click.Path(writable=True),
+            help="Path to save the output (defaults to tmp directory)",
+        )(f)
+        return f
+
+    return decorator
+
+
+@click.group()
+@click.version_option(__version__, "-v", "--version")
+def cli():
+    """
+    Stonkwise: A tool for learning technical trading analysis.
+
+    This CLI provides commands for analyzing and backtesting
+    trading strategies on historical price data.
+    """
+
+
+@cli.command()
+@ticker_option()
+@period_option()
+@click.option(
+    "--strategy",
+    "-s",
+    default="simple",
+    type=click.Choice(["simple", "ma_cross", "price_action"]),
+    help="Trading strategy to apply",
+)
+@date_options()
+@input_output_options()
+@click.option("--backtest/--no-backtest", default=False, help="Enable backtesting mode")
+@click.option(
+    "--cash",
+    type=float,
+    default=10000.0,
+    help="Initial cash for backtesting (default: 10000)",
+)
+@click.option(
+    "--commission",
+    type=float,
+    default=0.001,
+    help="Commission rate for trades (default: 0.001 = 0.1%)",
+)
+@click.option("--show-ma/--no-ma", default=False, help="Show moving averages on the plot")
+@click.option("--show-trend/--no-trend", default=False, help="Show trend direction on the plot")
+@click.option(
+    "--show-zones/--no-zones",
+    default=False,
+    help="Show supply and demand zones on the plot",
+)
+@click.option(
+    "--vectorized/--no-vectorized",
+    default=False,
+    help="Backtest supported strategies with the fast NumPy engine (no plot)",
+)
+@click.option(
+    "--format",
+    "results_format",
+    type=click.Choice(["parquet", "csv"]),
+    default=None,
+    help="File format for backtest results saved with --output (default: the extension of --output, or parquet)",
+)
+@click.option(
+    "--metrics",
+    callback=_parse_metrics,
+    help="Comma-separated backtest metrics to compute: sharpe, drawdown, returns, trades "
+    "(default: all; an empty value skips them for a faster plot-only run)",
+)
+def analyze(
+    ticker: Tuple[str],
+    period: str,
+    strategy: str,
+    start_date: Optional[datetime.datetime],
+    end_date: Optional[datetime.datetime],
+    input_file: Optional[str],
+    output: Optional[str],
+    backtest: bool,
+    cash: float,
+    commission: float,
+    show_ma: bool,
+    show_trend: bool,
+    show_zones: bool,
+    vectorized: bool,
+    results_format: Optional[str],
+    metrics: Tuple[str, ...],
+):
+    """
+    Analyze stock tickers and optionally run backtests.
+
+    This command provides a unified interface for analyzing price data,
+    visualizing charts, and running backtests with various strategies.
+    """
+    if backtest:
+        click.echo(f"Analyzing and backtesting {', '.join(ticker)} " f"with {period} period using {strategy} strategy")
+    else:
+        click.echo(f"Analyzing {', '.join(ticker)} with {period} " f"period using {strategy} strategy")
+
+    try:
+        # Import here to avoid circular imports
+        if backtest:
+            from stonkwise.backtester import backtest_tickers
+
+            backtest_tickers(
+                tickers=list(ticker),
+                period=period,
+                strategy=strategy,
+                start_date=start_date,
+                end_date=end_date,
+                input_file=input_file,
+                output_path=output,
+                initial_cash=cash,
+                commission=commission,
+                show_ma=show_ma,
+                show_trend=show_trend,
+                show_zones=show_zones,
+                vectorized=vectorized,
+                results_format=results_format,
+                metrics=metrics,
+            )
+        else:
+            from stonkwise.plotter import plot_tickers
+
+            plot_tickers(
+                tickers=list(ticker),
+                period=period,
+                start_date=start_date,
+                end_date=end_date,
+                input_file=input_file,
+                output_path=output,
+                show_ma=show_ma,
+                show_trend=show_trend,
+                show_zones=show_zones,
+            )
+    except Exception as e:
+        click.echo(f"Error during analysis: {e}", err=True)
+        return 1
+
+    return 0
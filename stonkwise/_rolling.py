@@ -0,0 +1,117 @@
+"""
+Streaming rolling extrema.
+
+Rolling maxima and minima computed with a monotonic deque (Lemire's streaming
+algorithm): every value enters and leaves the deque at most once, so a pass is
+O(N) regardless of the window length. Long sorted runs, which are common in
+trending price data, keep the deque short.
+
+The deque scan only pays off when it is compiled. Without Numba the extrema are
+instead reduced over a zero-copy ``sliding_window_view``, which is O(N*W) but
+runs in NumPy rather than a per-element Python loop.
+"""
+
+from typing import Callable
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from stonkwise.utils._njit import NUMBA_AVAILABLE, njit
+
+
+def fast_rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing rolling maximum, equivalent to ``pd.Series(values).rolling(window).max()``.
+
+    Args:
+        values: Input array
+        window: Window length
+
+    Returns:
+        Float array of the same length; the first ``window - 1`` positions (and
+        any window containing NaN) are NaN
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if not NUMBA_AVAILABLE:
+        return _window_reduce(values, window, np.max)
+    return _rolling_extreme(values, window, True)
+
+
+def fast_rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing rolling minimum, equivalent to ``pd.Series(values).rolling(window).min()``.
+
+    Args:
+        values: Input array
+        window: Window length
+
+    Returns:
+        Float array of the same length; the first ``window - 1`` positions (and
+        any window containing NaN) are NaN
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if not NUMBA_AVAILABLE:
+        return _window_reduce(values, window, np.min)
+    return _rolling_extreme(values, window, False)
+
+
+def _window_reduce(values: np.ndarray, window: int, reduce: Callable[..., np.ndarray]) -> np.ndarray:
+    """
+    Trailing rolling reduction over a sliding window view, NaN-padded at the front.
+
+    Args:
+        values: Float64 input array
+        window: Window length
+        reduce: NumPy reduction applied to each window (np.max or np.min)
+
+    Returns:
+        Float array of the same length
+    """
+    out = np.full(len(values), np.nan)
+    if 1 <= window <= len(values):
+        out[window - 1 :] = reduce(sliding_window_view(values, window), axis=-1)
+    return out
+
+
+@njit(cache=True)
+def _rolling_extreme(values: np.ndarray, window: int, is_max: bool) -> np.ndarray:
+    """
+    Rolling maximum (is_max) or minimum over a monotonic deque of indices.
+
+    The deque is a ring buffer of ``window`` slots holding the indices of the
+    values that can still become the window's extreme, in decreasing (max) or
+    increasing (min) order of value, so its head is always the current extreme.
+    """
+    num_values = len(values)
+    out = np.full(num_values, np.nan)
+    if window < 1:
+        return out
+
+    deque = np.empty(window, dtype=np.int64)
+    head = 0  # position of the first element, counted without wrapping
+    tail = 0  # one past the last element
+    last_nan = -window  # most recent NaN index; NaN windows stay NaN
+
+    for i in range(num_values):
+        value = values[i]
+
+        # Drop the head once it has left the window
+        if tail > head and deque[head % window] <= i - window:
+            head += 1
+
+        if np.isnan(value):
+            last_nan = i
+        else:
+            # Values dominated by the new one can never be the extreme again
+            while tail > head:
+                back = values[deque[(tail - 1) % window]]
+                if (is_max and back > value) or (not is_max and back < value):
+                    break
+                tail -= 1
+            deque[tail % window] = i
+            tail += 1
+
+        if i >= window - 1 and i - last_nan >= window:
+            out[i] = values[deque[head % window]]
+
+    return out
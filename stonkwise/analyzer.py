@@ -4,23 +4,26 @@ Main analyzer module for stonkwise.
 
 import datetime
 import os
-import pathlib
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
-import backtrader as bt
-import matplotlib.pyplot as plt
+# backtrader, pandas, matplotlib and the data sources are imported inside the functions
+# that need them, so importing this module stays cheap
+from stonkwise.utils.paths import tmp_dir, unique_path
+from stonkwise.utils.runner import build_cerebro, default_dates, worker_pool
 
-from stonkwise.data_sources import get_yahoo_data
-from stonkwise.strategies import SimpleStrategy
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def analyze_ticker(
     ticker: str,
     period: str = "day",
     strategy: str = "simple",
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-) -> None:
+    start_date: Optional[Union[str, datetime.datetime]] = None,
+    end_date: Optional[Union[str, datetime.datetime]] = None,
+    data: Optional["pd.DataFrame"] = None,
+    plot: bool = True,
+) -> float:
     """
     Analyze a stock ticker using the specified strategy and period.
 
@@ -28,31 +31,32 @@ def analyze_ticker(
         ticker: Stock ticker symbol (e.g., 'MSFT')
         period: Time period ('day', 'week', or '4h')
         strategy: Trading strategy to apply
-        start_date: Start date for analysis (YYYY-MM-DD), defaults to 1 year ago
-        end_date: End date for analysis (YYYY-MM-DD), defaults to today
+        start_date: Start date for analysis (YYYY-MM-DD or datetime), defaults to 1 year ago
+        end_date: End date for analysis (YYYY-MM-DD or datetime), defaults to today
+        data: Pre-fetched OHLCV DataFrame; downloaded from Yahoo Finance if not provided
+        plot: Whether to render the backtest chart and save it as a PNG
+
+    Returns:
+        Final portfolio value
     """
-    # Set default dates if not provided
-    if start_date is None:
-        start_date = (datetime.datetime.now() - datetime.timedelta(days=365)).strftime("%Y-%m-%d")
-    if end_date is None:
-        end_date = datetime.datetime.now().strftime("%Y-%m-%d")
-
-    # Create a cerebro entity
-    cerebro = bt.Cerebro()
-
-    # Add the strategy
-    if strategy == "simple":
-        cerebro.addstrategy(SimpleStrategy)
-    else:
-        # Default to SimpleStrategy for now
-        cerebro.addstrategy(SimpleStrategy)
+    start_date, end_date = default_dates(start_date, end_date)
+
+    # Create a cerebro with the strategy and starting cash configured, through the
+    # shared factory. No commission or analyzers, and the default observers
+    # only when they are going to be plotted.
+    cerebro = build_cerebro(strategy, cash=10000.0, commission=0.0, stdstats=plot, analyzers=())
 
     # Get and add the data
-    data = get_yahoo_data(ticker, start_date, end_date, period)
-    cerebro.adddata(data)
+    if data is None:
+        from stonkwise.data_sources import get_yahoo_data
 
-    # Set our desired cash start
-    cerebro.broker.setcash(10000.0)
+        feed = get_yahoo_data(ticker, start_date, end_date, period)
+    else:
+        from stonkwise.data_sources.yahoo import _to_feed
+
+        # Same feed as a download, so the bars keep the period's timeframe
+        feed = _to_feed(data, period)
+    cerebro.adddata(feed)
 
     # Print out the starting conditions
     print(f"Starting Portfolio Value: ${cerebro.broker.getvalue():.2f}")
@@ -61,54 +65,101 @@ def analyze_ticker(
     cerebro.run()
 
     # Print out the final result
-    print(f"Final Portfolio Value: ${cerebro.broker.getvalue():.2f}")
+    final_value = float(cerebro.broker.getvalue())
+    print(f"Final Portfolio Value: ${final_value:.2f}")
+
+    if not plot:
+        return final_value
+
+    # Plots are only ever saved to files, so render off-screen and never pull in a GUI toolkit
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
 
     # Plot the result without blocking
     # Set show=False to prevent the plot from blocking execution
     # Use style='bar' to ensure proper coloring of up/down days
-    fig = cerebro.plot(
+    figs = cerebro.plot(
         style="bar",
         barup="green",
         bardown="red",
         volup="green",
         voldown="red",
         show=False,
-    )[
-        0
-    ][0]
+    )
+    # One strategy on one feed gives exactly one figure; drop the nested lists right away
+    fig = figs[0][0] if figs and figs[0] else None
+    del figs
+    if fig is None:
+        print(f"No plot produced for {ticker}")
+        return final_value
 
     # Save the plot to a file in the tmp directory
-    project_root = pathlib.Path(__file__).parent.parent.parent
-    tmp_dir = project_root / "tmp"
-    os.makedirs(tmp_dir, exist_ok=True)
-
-    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-    plot_file = tmp_dir / f"{ticker}_{period}_{timestamp}_plot.png"
-
-    fig.savefig(plot_file)
+    with unique_path(tmp_dir() / f"{ticker}_{period}_{datetime.datetime.now():%Y%m%d%H%M%S}_plot.png") as plot_file:
+        fig.savefig(plot_file)
     print(f"Plot saved to: {plot_file}")
 
     # Close the figure to free up memory
     plt.close(fig)
 
+    return final_value
+
 
 def analyze_tickers(
     tickers: List[str],
     period: str = "day",
     strategy: str = "simple",
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-) -> None:
+    start_date: Optional[Union[str, datetime.datetime]] = None,
+    end_date: Optional[Union[str, datetime.datetime]] = None,
+    plot: Optional[bool] = None,
+) -> Dict[str, float]:
     """
     Analyze multiple stock tickers.
 
+    The data for all tickers is downloaded up front, then the backtests run
+    in parallel worker processes since each cerebro run is independent.
+
     Args:
         tickers: List of stock ticker symbols
         period: Time period ('day', 'week', or '4h')
         strategy: Trading strategy to apply
-        start_date: Start date for analysis (YYYY-MM-DD), defaults to 1 year ago
-        end_date: End date for analysis (YYYY-MM-DD), defaults to today
+        start_date: Start date for analysis (YYYY-MM-DD or datetime), defaults to 1 year ago
+        end_date: End date for analysis (YYYY-MM-DD or datetime), defaults to today
+        plot: Whether to save a chart per ticker; defaults to True for up to
+              4 tickers and False for larger batches
+
+    Returns:
+        Dictionary mapping each ticker to its final portfolio value
+    """
+    start_date, end_date = default_dates(start_date, end_date)
+    if plot is None:
+        # Rendering dominates small backtests, so skip it for large batches unless asked
+        plot = len(tickers) <= 4
+
+    from stonkwise.data_sources import get_yahoo_data_batch
+
+    # Fetch all tickers up front in batched requests
+    feeds = get_yahoo_data_batch(tickers, start_date, end_date, period)
+    jobs = [(ticker, period, strategy, start_date, end_date, feeds[ticker].p.dataname, plot) for ticker in tickers]
+
+    if len(jobs) == 1:
+        return dict([_analyze_job(jobs[0])])
+
+    with worker_pool(min(len(jobs), os.cpu_count() or 1)) as executor:
+        return dict(executor.map(_analyze_job, jobs))
+
+
+def _analyze_job(job: Tuple[str, str, str, Union[str, datetime.datetime], Union[str, datetime.datetime], "pd.DataFrame", bool]) -> Tuple[str, float]:
+    """
+    Run a single ticker analysis, used as the worker for analyze_tickers.
+
+    Args:
+        job: Tuple of (ticker, period, strategy, start_date, end_date, data, plot)
+
+    Returns:
+        Tuple of (ticker, final portfolio value)
     """
-    for ticker in tickers:
-        print(f"\nAnalyzing {ticker}...")
-        analyze_ticker(ticker, period, strategy, start_date, end_date)
+    ticker, period, strategy, start_date, end_date, data, plot = job
+    print(f"\nAnalyzing {ticker}...")
+    return ticker, analyze_ticker(ticker, period, strategy, start_date, end_date, data=data, plot=plot)
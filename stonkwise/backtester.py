@@ -5,24 +5,40 @@ This module provides functionality for backtesting trading strategies
 on historical price data.
 """
 
+import contextlib
 import datetime
+import os
 import pathlib
-from typing import Dict, List, Optional, Union
+from concurrent.futures import as_completed
+from typing import TYPE_CHECKING, Any, ContextManager, Dict, Iterable, List, Optional, Tuple, Union
 
-import backtrader as bt
-import numpy as np
-import pandas as pd
+from stonkwise.utils.feeds import feed_to_dataframe, feed_to_ohlcv
+from stonkwise.utils.runner import METRICS, build_cerebro, check_metrics, default_dates, prefetch, worker_pool
 
-from stonkwise.data_sources import get_yahoo_data
-from stonkwise.strategies import PriceActionStrategy, SimpleStrategy
+# backtrader, pandas, the strategies and the data sources are imported inside the
+# functions that need them, so importing this module stays cheap
+if TYPE_CHECKING:
+    import backtrader as bt
+    import pandas as pd
+
+# Result keys provided by the analyzer of each metric name (see METRICS)
+_METRIC_KEYS: Dict[str, Tuple[str, ...]] = {
+    "sharpe": ("sharpe_ratio",),
+    "drawdown": ("max_drawdown",),
+    "returns": ("total_return", "annual_return"),
+    "trades": ("total_trades", "won_trades", "lost_trades", "win_rate"),
+}
+
+# Results file format implied by each output file extension
+_SUFFIX_FORMATS: Dict[str, str] = {".parquet": "parquet", ".csv": "csv"}
 
 
 def backtest_tickers(
     tickers: List[str],
     period: str = "day",
     strategy: str = "simple",
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    start_date: Optional[Union[str, datetime.datetime]] = None,
+    end_date: Optional[Union[str, datetime.datetime]] = None,
     input_file: Optional[str] = None,
     output_path: Optional[str] = None,
     initial_cash: float = 10000.0,
@@ -30,16 +46,26 @@ def backtest_tickers(
     show_ma: bool = False,
     show_trend: bool = False,
     show_zones: bool = False,
-) -> None:
+    vectorized: bool = False,
+    results_format: Optional[str] = None,
+    metrics: Iterable[str] = METRICS,
+) -> Dict[str, Dict[str, Union[float, int]]]:
     """
     Backtest trading strategies on multiple tickers.
 
+    Each ticker's backtest is independent and CPU-bound, so with more than one
+    ticker the backtests run in parallel worker processes. Downloads happen in a
+    background thread of this process, a few tickers ahead of the workers, so
+    network time overlaps with the backtests instead of holding up a worker.
+    The results of all tickers are written to a single file when output_path is
+    set.
+
     Args:
         tickers: List of stock ticker symbols
         period: Time period ('day', 'week', or '4h')
         strategy: Trading strategy to apply
-        start_date: Start date for backtesting (YYYY-MM-DD), defaults to 1 year ago
-        end_date: End date for backtesting (YYYY-MM-DD), defaults to today
+        start_date: Start date for backtesting (YYYY-MM-DD or datetime), defaults to 1 year ago
+        end_date: End date for backtesting (YYYY-MM-DD or datetime), defaults to today
         input_file: Path to input CSV or Parquet file (instead of Yahoo Finance)
         output_path: Path to save the backtest results (defaults to tmp directory)
         initial_cash: Initial cash for backtesting
@@ -47,31 +73,84 @@ def backtest_tickers(
         show_ma: Whether to show moving averages on the plot
         show_trend: Whether to show trend direction on the plot
         show_zones: Whether to show supply and demand zones on the plot
+        vectorized: Whether to use the NumPy fast path for supported strategies
+            (no plot is created, ignored when showing trend or zones)
+        results_format: Format of the results file, 'parquet' or 'csv'; defaults to the
+            extension of output_path, or parquet
+        metrics: Metrics to compute (see METRICS); each one adds a backtrader
+            analyzer that runs on every bar
+
+    Returns:
+        Dictionary mapping each ticker to its backtest results
+    """
+    # Resolve the default dates once so the downloads and the workers agree on them
+    start_date, end_date = default_dates(start_date, end_date)
+
+    # Reject a format that contradicts the output file name before running anything
+    if output_path:
+        results_format = _results_format(output_path, results_format)
+
+    options = {
+        "period": period,
+        "strategy": strategy,
+        "start_date": start_date,
+        "end_date": end_date,
+        "input_file": input_file,
+        "output_path": output_path,
+        "initial_cash": initial_cash,
+        "commission": commission,
+        "show_ma": show_ma,
+        "show_trend": show_trend,
+        "show_zones": show_zones,
+        "vectorized": vectorized,
+        "metrics": tuple(metrics),
+        # Collected and written once below instead of one file per ticker
+        "export": False,
+    }
+
+    if len(tickers) <= 1:
+        ordered = dict(_run_one(ticker, options) for ticker in tickers)
+    else:
+        results: Dict[str, Dict[str, Union[float, int]]] = {}
+        max_workers = min(len(tickers), os.cpu_count() or 1)
+        with worker_pool(max_workers) as executor:
+            # Each backtest is submitted as soon as its bars have been downloaded
+            futures = {executor.submit(_run_one, ticker, options, data): ticker for ticker, data in prefetch(tickers, options, max_workers)}
+            for future in as_completed(futures):
+                ticker, ticker_results = future.result()
+                results[ticker] = ticker_results
+
+        # Report in the order the tickers were requested, not the order they finished
+        ordered = {ticker: results[ticker] for ticker in tickers}
+
+    if output_path and ordered:
+        export_batch_results(ordered, strategy, output_path, results_format, name=tickers[0] if len(tickers) == 1 else "batch")
+
+    return ordered
+
+
+def _run_one(ticker: str, options: Dict[str, Any], data: Optional["pd.DataFrame"] = None) -> Tuple[str, Dict[str, Union[float, int]]]:
+    """
+    Backtest a single ticker, used as the worker for backtest_tickers.
+
+    Args:
+        ticker: Stock ticker symbol
+        options: Keyword arguments for backtest_ticker
+        data: Pre-fetched OHLCV DataFrame, if any
+
+    Returns:
+        Tuple of (ticker, backtest results)
     """
-    for ticker in tickers:
-        print(f"\nBacktesting {ticker}...")
-        backtest_ticker(
-            ticker=ticker,
-            period=period,
-            strategy=strategy,
-            start_date=start_date,
-            end_date=end_date,
-            input_file=input_file,
-            output_path=output_path,
-            initial_cash=initial_cash,
-            commission=commission,
-            show_ma=show_ma,
-            show_trend=show_trend,
-            show_zones=show_zones,
-        )
+    print(f"\nBacktesting {ticker}...")
+    return ticker, backtest_ticker(ticker=ticker, data=data, **options)
 
 
 def backtest_ticker(
     ticker: str,
     period: str = "day",
     strategy: str = "simple",
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    start_date: Optional[Union[str, datetime.datetime]] = None,
+    end_date: Optional[Union[str, datetime.datetime]] = None,
     input_file: Optional[str] = None,
     output_path: Optional[str] = None,
     initial_cash: float = 10000.0,
@@ -79,6 +158,11 @@ def backtest_ticker(
     show_ma: bool = False,
     show_trend: bool = False,
     show_zones: bool = False,
+    vectorized: bool = False,
+    results_format: Optional[str] = None,
+    metrics: Iterable[str] = METRICS,
+    export: bool = True,
+    data: Optional["pd.DataFrame"] = None,
 ) -> Dict[str, Union[float, int]]:
     """
     Backtest a trading strategy on a single ticker.
@@ -87,8 +171,8 @@ def backtest_ticker(
         ticker: Stock ticker symbol
         period: Time period ('day', 'week', or '4h')
         strategy: Trading strategy to apply
-        start_date: Start date for backtesting (YYYY-MM-DD), defaults to 1 year ago
-        end_date: End date for backtesting (YYYY-MM-DD), defaults to today
+        start_date: Start date for backtesting (YYYY-MM-DD or datetime), defaults to 1 year ago
+        end_date: End date for backtesting (YYYY-MM-DD or datetime), defaults to today
         input_file: Path to input CSV or Parquet file (instead of Yahoo Finance)
         output_path: Path to save the backtest results (defaults to tmp directory)
         initial_cash: Initial cash for backtesting
@@ -96,111 +180,83 @@ def backtest_ticker(
         show_ma: Whether to show moving averages on the plot
         show_trend: Whether to show trend direction on the plot
         show_zones: Whether to show supply and demand zones on the plot
+        vectorized: Whether to use the NumPy fast path for supported strategies
+            (no plot is created, ignored when showing trend or zones)
+        results_format: Format of the results file, 'parquet' or 'csv'; defaults to the
+            extension of output_path, or parquet
+        metrics: Metrics to compute (see METRICS); the results only contain the
+            keys of these metrics besides the initial and final value
+        export: Whether to write the results file to output_path
+        data: Pre-fetched OHLCV DataFrame from the data source; loaded from
+            input_file or Yahoo Finance if not provided
 
     Returns:
         Dictionary with backtest results
     """
     # Set default dates if not provided
-    if start_date is None:
-        start_date = (datetime.datetime.now() - datetime.timedelta(days=365)).strftime("%Y-%m-%d")
-    if end_date is None:
-        end_date = datetime.datetime.now().strftime("%Y-%m-%d")
-
-    # Create a cerebro entity
-    cerebro = bt.Cerebro()
-
-    # Add the strategy
-    if strategy == "simple":
-        cerebro.addstrategy(SimpleStrategy)
-    elif strategy == "ma_cross":
-        # This will be implemented later
-        cerebro.addstrategy(SimpleStrategy)
-    elif strategy == "price_action":
-        # This will be implemented as part of Issue #4
-        cerebro.addstrategy(PriceActionStrategy)
-    else:
-        # Default to SimpleStrategy
-        cerebro.addstrategy(SimpleStrategy)
+    start_date, end_date = default_dates(start_date, end_date)
+    metrics = check_metrics(metrics)
+    if output_path and export:
+        results_format = _results_format(output_path, results_format)
+
+    # Get data from the pre-fetched bars, a file or Yahoo Finance
+    if data is not None:
+        from stonkwise.data_sources.yahoo import _to_feed
 
-    # Get data from file or Yahoo Finance
-    if input_file:
+        feed = _to_feed(data, period)
+    elif input_file:
         # Import here to avoid circular imports
         from stonkwise.plotter import load_csv_data, load_parquet_data
 
         # Determine file type from extension
         if input_file.endswith(".csv"):
-            data = load_csv_data(input_file)
+            feed = load_csv_data(input_file)
         elif input_file.endswith(".parquet"):
-            data = load_parquet_data(input_file)
+            feed = load_parquet_data(input_file)
         else:
             raise ValueError(f"Unsupported file format: {input_file}")
     else:
+        from stonkwise.data_sources import get_yahoo_data
+
         # Get data from Yahoo Finance
-        data = get_yahoo_data(ticker, start_date, end_date, period)
+        feed = get_yahoo_data(ticker, start_date, end_date, period)
 
-    # Add the data to cerebro
-    cerebro.adddata(data)
+    # Use the NumPy fast path when requested and nothing needs to be plotted
+    if vectorized and not (show_trend or show_zones):
+        from stonkwise.vector_backtest import VECTORIZABLE
 
-    # Set our desired cash start
-    cerebro.broker.setcash(initial_cash)
+        if strategy in VECTORIZABLE:
+            return _backtest_vectorized(feed, ticker, strategy, output_path if export else None, initial_cash, commission, results_format, metrics)
 
-    # Set the commission
-    cerebro.broker.setcommission(commission=commission)
+    # Create a cerebro with the strategy, broker and the requested analyzers
+    # configured. The default observers are kept because the plot below draws them.
+    cerebro = build_cerebro(strategy, initial_cash, commission, stdstats=True, analyzers=metrics)
 
-    # Add analyzers
-    cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name="sharpe")
-    cerebro.addanalyzer(bt.analyzers.DrawDown, _name="drawdown")
-    cerebro.addanalyzer(bt.analyzers.Returns, _name="returns")
-    cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name="trades")
+    # Add the data to cerebro
+    cerebro.adddata(feed)
 
     # Add market structure detection if requested
     trend = None
     zones = None
     if show_trend or show_zones:
-        # Run cerebro once to load the data
-        cerebro.run()
-        cerebro = bt.Cerebro()  # Create a new cerebro instance
-        cerebro.adddata(data)  # Re-add the data
-
-        if strategy == "simple":
-            cerebro.addstrategy(SimpleStrategy)
-        elif strategy == "ma_cross":
-            cerebro.addstrategy(SimpleStrategy)
-        elif strategy == "price_action":
-            cerebro.addstrategy(PriceActionStrategy)
-        else:
-            cerebro.addstrategy(SimpleStrategy)
-
-        cerebro.broker.setcash(initial_cash)
-        cerebro.broker.setcommission(commission=commission)
-        cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name="sharpe")
-        cerebro.addanalyzer(bt.analyzers.DrawDown, _name="drawdown")
-        cerebro.addanalyzer(bt.analyzers.Returns, _name="returns")
-        cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name="trades")
-
         # Import here to avoid circular imports
         from stonkwise.market_structure import MarketStructureDetector
 
-        # Create a detector and analyze the data
-        detector = MarketStructureDetector()
+        # Use the shared default detector; it skips detection for prices it has already seen
+        detector = MarketStructureDetector.get()
 
-        # Get the data as a pandas DataFrame for market structure analysis
-        df = pd.DataFrame()
-        df["Open"] = np.array(data.open)
-        df["High"] = np.array(data.high)
-        df["Low"] = np.array(data.low)
-        df["Close"] = np.array(data.close)
-        df["Volume"] = np.array(data.volume)
-        df.index = pd.to_datetime([data.num2date(x) for x in data.datetime])
+        # Get the bars as NumPy arrays for market structure analysis; the feed
+        # itself is left untouched for the single backtest run below
+        bars = feed_to_ohlcv(feed)
 
         if show_trend:
-            trend = detector.detect_structure(df)
+            trend = detector.detect_structure(bars)
             print(f"Detected market structure: {trend.value}")
 
         if show_zones:
             if trend is None:
-                detector.detect_structure(df)
-            zones = detector.get_supply_demand_zones(df)
+                detector.detect_structure(bars)
+            zones = detector.get_supply_demand_zones(bars)
             print(f"Detected {len(zones['supply'])} supply zones " f"and {len(zones['demand'])} demand zones")
 
     # Print out the starting conditions
@@ -214,30 +270,10 @@ def backtest_ticker(
     final_value = cerebro.broker.getvalue()
     print(f"Final Portfolio Value: ${final_value:.2f}")
 
-    # Get the analyzers results
-    strat = results[0]
-    sharpe = strat.analyzers.sharpe.get_analysis()
-    drawdown = strat.analyzers.drawdown.get_analysis()
-    returns = strat.analyzers.returns.get_analysis()
-    trades = strat.analyzers.trades.get_analysis()
-
-    # Print the results
-    print("\nBacktest Results:")
-    print(f"Sharpe Ratio: {sharpe.get('sharperatio', 0.0):.3f}")
-    print(f"Max Drawdown: {drawdown.get('max', {}).get('drawdown', 0.0):.2%}")
-    print(f"Total Return: {returns.get('rtot', 0.0):.2%}")
-    print(f"Annual Return: {returns.get('rnorm', 0.0):.2%}")
-
-    # Print trade statistics
-    total_trades = trades.get("total", {}).get("total", 0)
-    won_trades = trades.get("won", {}).get("total", 0)
-    lost_trades = trades.get("lost", {}).get("total", 0)
-    win_rate = won_trades / total_trades if total_trades > 0 else 0.0
-
-    print(f"Total Trades: {total_trades}")
-    print(f"Won Trades: {won_trades}")
-    print(f"Lost Trades: {lost_trades}")
-    print(f"Win Rate: {win_rate:.2%}")
+    # Collect the results of the registered analyzers
+    results_dict: Dict[str, Union[float, int]] = {"initial_value": initial_cash, "final_value": final_value}
+    results_dict.update(_analyzer_results(results[0], metrics))
+    _print_results(results_dict, "Backtest Results")
 
     # Plot the result using the plotter module
     from stonkwise.plotter import create_plot
@@ -254,28 +290,113 @@ def backtest_ticker(
 
     print(f"Plot saved to: {plot_path}")
 
-    # Prepare results dictionary
-    results_dict = {
-        "initial_value": initial_cash,
-        "final_value": final_value,
-        "total_return": returns.get("rtot", 0.0),
-        "annual_return": returns.get("rnorm", 0.0),
-        "sharpe_ratio": sharpe.get("sharperatio", 0.0),
-        "max_drawdown": drawdown.get("max", {}).get("drawdown", 0.0),
-        "total_trades": total_trades,
-        "won_trades": won_trades,
-        "lost_trades": lost_trades,
-        "win_rate": win_rate,
-    }
+    # Export results if output_path is provided
+    if output_path and export:
+        export_results(results_dict, ticker, strategy, output_path, results_format)
 
-    # Export results to CSV if output_path is provided
+    return results_dict
+
+
+def _backtest_vectorized(
+    data: "bt.feeds.DataBase",
+    ticker: str,
+    strategy: str,
+    output_path: Optional[str],
+    initial_cash: float,
+    commission: float,
+    results_format: Optional[str] = None,
+    metrics: Tuple[str, ...] = METRICS,
+) -> Dict[str, Union[float, int]]:
+    """
+    Backtest a single ticker on the vectorized path, without a plot.
+
+    Args:
+        data: backtrader data feed
+        ticker: Stock ticker symbol
+        strategy: Trading strategy to apply (a key of VECTORIZABLE)
+        output_path: Path to save the backtest results (no file is written if None)
+        initial_cash: Initial cash for backtesting
+        commission: Commission rate for trades
+        results_format: Format of the results file, 'parquet' or 'csv'; defaults to the
+            extension of output_path, or parquet
+        metrics: Metrics to report (see METRICS)
+
+    Returns:
+        Dictionary with backtest results
+    """
+    from stonkwise.vector_backtest import VECTORIZABLE, run_vector
+
+    # All metrics come out of the same pass here, so the unrequested ones are just dropped
+    vector_results = run_vector(feed_to_dataframe(data), VECTORIZABLE[strategy], initial_cash, commission)
+    keys = ["initial_value", "final_value"] + [key for metric in metrics for key in _METRIC_KEYS[metric]]
+    results_dict = {key: vector_results[key] for key in keys}
+
+    # Print the results
+    print(f"Final Portfolio Value: ${results_dict['final_value']:.2f}")
+    _print_results(results_dict, "Backtest Results (vectorized)")
+
+    # Export results if output_path is provided
     if output_path:
-        export_results(results_dict, ticker, strategy, output_path)
+        export_results(results_dict, ticker, strategy, output_path, results_format)
 
     return results_dict
 
 
-def export_results(results: Dict[str, Union[float, int]], ticker: str, strategy: str, output_path: str) -> None:
+def _analyzer_results(strat: "bt.Strategy", metrics: Tuple[str, ...]) -> Dict[str, Union[float, int]]:
+    """
+    Flatten the analyses of a finished strategy into result values.
+
+    Args:
+        strat: Strategy returned by cerebro.run()
+        metrics: Metrics whose analyzers were registered
+
+    Returns:
+        Dictionary with the result keys of each metric
+    """
+    results: Dict[str, Union[float, int]] = {}
+    if "sharpe" in metrics:
+        results["sharpe_ratio"] = strat.analyzers.sharpe.get_analysis().get("sharperatio", 0.0)
+    if "drawdown" in metrics:
+        results["max_drawdown"] = strat.analyzers.drawdown.get_analysis().get("max", {}).get("drawdown", 0.0)
+    if "returns" in metrics:
+        returns = strat.analyzers.returns.get_analysis()
+        results["total_return"] = returns.get("rtot", 0.0)
+        results["annual_return"] = returns.get("rnorm", 0.0)
+    if "trades" in metrics:
+        trades = strat.analyzers.trades.get_analysis()
+        total_trades = trades.get("total", {}).get("total", 0)
+        won_trades = trades.get("won", {}).get("total", 0)
+        results["total_trades"] = total_trades
+        results["won_trades"] = won_trades
+        results["lost_trades"] = trades.get("lost", {}).get("total", 0)
+        results["win_rate"] = won_trades / total_trades if total_trades > 0 else 0.0
+    return results
+
+
+def _print_results(results: Dict[str, Union[float, int]], title: str) -> None:
+    """
+    Print the metrics present in a results dictionary.
+
+    Args:
+        results: Backtest results
+        title: Heading printed above the metrics
+    """
+    print(f"\n{title}:")
+    if "sharpe_ratio" in results:
+        print(f"Sharpe Ratio: {results['sharpe_ratio']:.3f}")
+    if "max_drawdown" in results:
+        print(f"Max Drawdown: {results['max_drawdown']:.2%}")
+    if "total_return" in results:
+        print(f"Total Return: {results['total_return']:.2%}")
+        print(f"Annual Return: {results['annual_return']:.2%}")
+    if "total_trades" in results:
+        print(f"Total Trades: {results['total_trades']}")
+        print(f"Won Trades: {results['won_trades']}")
+        print(f"Lost Trades: {results['lost_trades']}")
+        print(f"Win Rate: {results['win_rate']:.2%}")
+
+
+def export_results(results: Dict[str, Union[float, int]], ticker: str, strategy: str, output_path: str, results_format: Optional[str] = None) -> None:
     """
     Export backtest results to a file.
 
@@ -284,23 +405,87 @@ def export_results(results: Dict[str, Union[float, int]], ticker: str, strategy:
         ticker: Stock ticker symbol
         strategy: Trading strategy used
         output_path: Path to save the results
+        results_format: File format, 'parquet' (zstd-compressed) or 'csv'; defaults
+            to the extension of output_path, or parquet
+    """
+    export_batch_results({ticker: results}, strategy, output_path, results_format, name=ticker)
+
+
+def export_batch_results(
+    results: Dict[str, Dict[str, Union[float, int]]],
+    strategy: str,
+    output_path: str,
+    results_format: Optional[str] = None,
+    name: str = "batch",
+) -> None:
+    """
+    Export the backtest results of several tickers to a single file, one row per ticker.
+
+    Args:
+        results: Dictionary mapping each ticker to its backtest results
+        strategy: Trading strategy used
+        output_path: Path to save the results
+        results_format: File format, 'parquet' (zstd-compressed) or 'csv'; defaults
+            to the extension of output_path, or parquet
+        name: Prefix for the file name when output_path is a directory
     """
+    results_format = _results_format(output_path, results_format)
+
+    now = datetime.datetime.now()
+
     # Convert the output_path to a Path object
     path = pathlib.Path(output_path)
 
-    # If it's a directory, create a file name
+    # If it's a directory, create a file name that no other export is using
+    target: ContextManager[pathlib.Path]
     if path.is_dir():
-        timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-        path = path / f"{ticker}_{strategy}_{timestamp}_results.csv"
+        from stonkwise.utils.paths import unique_path
+
+        target = unique_path(path / f"{name}_{strategy}_{now:%Y%m%d%H%M%S}_results.{results_format}")
+    else:
+        target = contextlib.nullcontext(path)
 
-    # Create a DataFrame from the results
-    df = pd.DataFrame([results])
+    import pandas as pd
+
+    # Create a DataFrame with one row per ticker
+    df = pd.DataFrame(list(results.values()))
 
     # Add ticker and strategy columns
-    df["ticker"] = ticker
+    df["ticker"] = list(results)
     df["strategy"] = strategy
-    df["date"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    df["date"] = now.strftime("%Y-%m-%d %H:%M:%S")
 
-    # Save to CSV
-    df.to_csv(path, index=False)
+    # Save in the requested format
+    with target as path:
+        if results_format == "parquet":
+            df.to_parquet(path, compression="zstd", index=False)
+        else:
+            df.to_csv(path, index=False)
     print(f"Results exported to: {path}")
+
+
+def _results_format(output_path: str, results_format: Optional[str]) -> str:
+    """
+    Resolve the format of a results file.
+
+    A file name ending in .csv or .parquet implies its format, so that an
+    explicit format contradicting it is rejected instead of writing e.g.
+    Parquet bytes to a .csv file.
+
+    Args:
+        output_path: Path to save the results (a file or a directory)
+        results_format: Requested format, 'parquet' or 'csv', or None to infer it
+
+    Returns:
+        'parquet' or 'csv'
+    """
+    if results_format not in (None, "parquet", "csv"):
+        raise ValueError(f"Unsupported results format: {results_format}")
+
+    path = pathlib.Path(output_path)
+    suffix_format = None if path.is_dir() else _SUFFIX_FORMATS.get(path.suffix.lower())
+    if suffix_format is None:
+        return results_format or "parquet"
+    if results_format not in (None, suffix_format):
+        raise ValueError(f"Results format {results_format!r} does not match the output file {output_path}")
+    return suffix_format
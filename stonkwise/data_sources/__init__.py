@@ -2,6 +2,28 @@
 Data sources for fetching market data for backtesting.
 """
 
-from .yahoo import get_yahoo_data
+import importlib
+from typing import Any
 
-__all__ = ["get_yahoo_data"]
+__all__ = ["get_yahoo_data", "get_yahoo_data_batch"]
+
+# Module providing each public name; it is only imported when the name is first accessed
+_LAZY_EXPORTS = {
+    "get_yahoo_data": ".yahoo",
+    "get_yahoo_data_batch": ".yahoo",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the data source module that provides name on first access (PEP 562)."""
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    # Cache it so later lookups skip this function
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """List the lazy exports along with the module's own attributes."""
+    return sorted(set(globals()) | set(__all__))
@@ -7,13 +7,53 @@ for backtesting trading strategies.
 """
 
 import datetime
+import functools
+import hashlib
 import os
 import pathlib
-from typing import Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Optional, Union, cast
 
-import backtrader as bt
-import pandas as pd
-import yfinance as yf
+# backtrader, pandas and yfinance are imported inside the functions that need them,
+# so importing the data sources (e.g. from the CLI) stays cheap
+if TYPE_CHECKING:
+    import backtrader as bt
+    import pandas as pd
+
+# Map our period values to yfinance interval parameter values
+# yfinance uses different terminology for time intervals
+_YF_INTERVAL_MAP = MappingProxyType(
+    {
+        "day": "1d",  # Daily data
+        "week": "1wk",  # Weekly data
+        "4h": "1h",  # For 4h, we'll download hourly and resample
+    }
+)
+
+# Map our period values to the backtrader (timeframe, compression) of the bars
+# we hand to cerebro, so analyzers and resampling see the right bar size. The
+# timeframe is the name of a bt.TimeFrame member, looked up when the feed is built.
+# Both maps are read-only module constants shared by every call.
+_PERIOD_MAP = MappingProxyType(
+    {
+        "day": ("Days", 1),
+        "week": ("Weeks", 1),
+        "4h": ("Minutes", 240),
+    }
+)
+_DEFAULT_TIMEFRAME = ("Days", 1)
+
+# Price columns that are stored as float32
+_PRICE_COLUMNS = ("Open", "High", "Low", "Close")
+
+# Yahoo caps a single multi-symbol request at 20 symbols, so batched downloads
+# are split into chunks of this size. Larger chunk sizes are clamped to 99.
+_BATCH_SIZE = 20
+_MAX_BATCH_SIZE = 99
+
+# Threads used to post-process the tickers of a batched download
+_FINALIZE_THREADS = 8
 
 
 def get_yahoo_data(
@@ -21,7 +61,8 @@ def get_yahoo_data(
     start_date: Union[str, datetime.datetime],
     end_date: Optional[Union[str, datetime.datetime]] = None,
     period: str = "day",
-) -> bt.feeds.GenericCSVData:
+    force_refresh: bool = False,
+) -> "bt.feeds.PandasData":
     """
     Get stock data from Yahoo Finance using yfinance package.
 
@@ -29,6 +70,11 @@ def get_yahoo_data(
     Yahoo Finance using the yfinance package. It then converts the data into a
     backtrader data feed that can be used for backtesting trading strategies.
 
+    Downloads are cached as Parquet files keyed by ticker, date range and period
+    under ``~/.cache/stonkwise`` (override with ``STONKWISE_CACHE_DIR``), so
+    repeated calls for the same data skip the network round trip. Set
+    ``STONKWISE_NO_CACHE=1`` to bypass the cache entirely.
+
     Args:
         ticker: Stock ticker symbol (e.g., 'MSFT', 'AAPL', 'GOOGL')
         start_date: Start date for data (YYYY-MM-DD string or datetime object)
@@ -38,6 +84,7 @@ def get_yahoo_data(
                 - 'day': Daily data (default)
                 - 'week': Weekly data
                 - '4h': 4-hour data (will be resampled from hourly data)
+        force_refresh: If True, ignore any cached copy and download again
 
     Returns:
         backtrader data feed object that can be added to a Cerebro instance
@@ -47,96 +94,335 @@ def get_yahoo_data(
         - For 4-hour data, it downloads hourly data and resamples it
         - The returned data feed can be directly used with backtrader's Cerebro engine
     """
+    import yfinance as yf
+
     # Convert string dates to datetime objects if needed
     # This ensures consistent date handling regardless of input format
-    if isinstance(start_date, str):
-        start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d")
+    start_date = _as_datetime(start_date)
 
     if end_date is None:
         # Default to current date if end_date is not provided
         end_date = datetime.datetime.now()
-    elif isinstance(end_date, str):
-        end_date = datetime.datetime.strptime(end_date, "%Y-%m-%d")
+    else:
+        end_date = _as_datetime(end_date)
+
+    # Serve the data from the local cache when we already have it. Only ranges
+    # that end before today are cached: their bars can no longer change.
+    use_cache = not os.environ.get("STONKWISE_NO_CACHE") and _is_historical(end_date)
+    cache_file = _cache_path(ticker, start_date, end_date, period)
+    if use_cache and cache_file.exists() and not force_refresh:
+        print(f"Loading {ticker} data from cache: {cache_file}")
+        data_df = _read_cache(str(cache_file), cache_file.stat().st_mtime_ns)
+    else:
+        # Get the appropriate interval value for yfinance
+        interval = _YF_INTERVAL_MAP.get(period, "1d")  # Default to daily if unknown period
+
+        # Download data using yfinance
+        # The yfinance.download function fetches historical market data from Yahoo Finance
+        print(f"Downloading {ticker} data from Yahoo Finance...")
+        data_df = yf.download(
+            ticker,  # The stock ticker symbol
+            start=start_date,  # Start date for data
+            end=end_date,  # End date for data
+            interval=interval,  # Time interval between data points
+            auto_adjust=True,  # Adjust all OHLC automatically (for splits, dividends)
+            threads=True,  # Let yfinance fetch through its thread pool
+            progress=False,  # No progress bar; we print our own status line
+        )
+
+        # Clean up the DataFrame and resample to 4-hour bars if needed
+        data_df = _prepare_frame(data_df, ticker, period)
+
+        if use_cache:
+            _write_cache(cache_file, data_df)
+
+    # Create a backtrader data feed directly from the DataFrame
+    return _to_feed(data_df, period)
+
+
+def _is_historical(end_date: datetime.datetime) -> bool:
+    """
+    Check whether a download range is complete and can be cached.
+
+    yfinance treats the end date as exclusive, so a range ending at or before
+    midnight today only holds bars that have already closed.
+
+    Args:
+        end_date: End of the requested range
+
+    Returns:
+        True if no more bars can be added to the range
+    """
+    return end_date <= datetime.datetime.combine(datetime.date.today(), datetime.time())
 
-    # Map our period values to yfinance interval parameter values
-    # yfinance uses different terminology for time intervals
-    yf_period_map = {
-        "day": "1d",  # Daily data
-        "week": "1wk",  # Weekly data
-        "4h": "1h",  # For 4h, we'll download hourly and resample
-    }
 
-    # Get the appropriate interval value for yfinance
-    interval = yf_period_map.get(period, "1d")  # Default to daily if unknown period
-
-    # Download data using yfinance
-    # The yfinance.download function fetches historical market data from Yahoo Finance
-    print(f"Downloading {ticker} data from Yahoo Finance...")
-    data_df = yf.download(
-        ticker,  # The stock ticker symbol
-        start=start_date,  # Start date for data
-        end=end_date,  # End date for data
-        interval=interval,  # Time interval between data points
-        auto_adjust=True,  # Adjust all OHLC automatically (for splits, dividends)
+def _write_cache(cache_file: pathlib.Path, data_df: "pd.DataFrame") -> None:
+    """
+    Store a download in the cache.
+
+    Only successful (non-empty) downloads are cached, so a failed request is
+    retried next time.
+
+    Args:
+        cache_file: Path of the cache file
+        data_df: Prepared OHLCV DataFrame
+    """
+    if len(data_df) > 0:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        data_df.to_parquet(cache_file, compression="zstd")
+
+
+@functools.lru_cache(maxsize=32)
+def _read_cache(path: str, mtime_ns: int) -> "pd.DataFrame":
+    """
+    Read a cached download, keeping recent reads in memory.
+
+    Repeated requests in one process (e.g. plotting and then backtesting the
+    same ticker) skip the Parquet read. The modification time is part of the
+    key so a cache file that is rewritten is read again.
+
+    Args:
+        path: Path of the cache file
+        mtime_ns: Modification time of the cache file in nanoseconds
+
+    Returns:
+        The cached DataFrame, shared between callers, which must not modify it
+    """
+    import pandas as pd
+
+    return pd.read_parquet(path)
+
+
+def _to_feed(data_df: "pd.DataFrame", period: str) -> "bt.feeds.PandasData":
+    """
+    Wrap an OHLCV DataFrame in a backtrader PandasData feed.
+
+    Args:
+        data_df: DataFrame with Open, High, Low, Close and Volume columns
+        period: Time period of the data ('day', 'week' or '4h')
+
+    Returns:
+        backtrader data feed with the timeframe and compression of the period
+    """
+    import backtrader as bt
+
+    timeframe, compression = _PERIOD_MAP.get(period, _DEFAULT_TIMEFRAME)
+    return bt.feeds.PandasData(
+        dataname=data_df,
+        datetime=None,  # Use the index as datetime
+        open="Open",
+        high="High",
+        low="Low",
+        close="Close",
+        volume="Volume",
+        openinterest=-1,  # No open interest data available
+        timeframe=getattr(bt.TimeFrame, timeframe),
+        compression=compression,
     )
 
+
+def _as_datetime(value: Union[str, datetime.datetime]) -> datetime.datetime:
+    """
+    Convert a date argument to a datetime, passing datetime objects straight through.
+
+    Args:
+        value: Date as a YYYY-MM-DD string or datetime object
+
+    Returns:
+        The date as a datetime object
+    """
+    if isinstance(value, datetime.datetime):
+        return value
+    # date.fromisoformat is a C fast path, unlike strptime or pd.to_datetime
+    return datetime.datetime.combine(datetime.date.fromisoformat(value), datetime.time())
+
+
+def _cache_path(ticker: str, start_date: datetime.datetime, end_date: datetime.datetime, period: str) -> pathlib.Path:
+    """
+    Get the Parquet cache file for a download request.
+
+    Args:
+        ticker: Stock ticker symbol
+        start_date: Start date of the request
+        end_date: End date of the request
+        period: Time period of the data
+
+    Returns:
+        Path of the cache file (which may not exist yet)
+    """
+    cache_dir = os.environ.get("STONKWISE_CACHE_DIR") or pathlib.Path.home() / ".cache" / "stonkwise"
+    # Full timestamps, so intraday requests on the same day do not share an entry
+    key = hashlib.sha1(f"{ticker}|{start_date.isoformat()}|{end_date.isoformat()}|{period}".encode()).hexdigest()
+    return pathlib.Path(cache_dir) / f"{key}.parquet"
+
+
+def get_yahoo_data_batch(
+    tickers: List[str],
+    start_date: Union[str, datetime.datetime],
+    end_date: Optional[Union[str, datetime.datetime]] = None,
+    period: str = "day",
+    batch_size: int = _BATCH_SIZE,
+) -> Dict[str, "bt.feeds.PandasData"]:
+    """
+    Get stock data for several tickers from Yahoo Finance in batched requests.
+
+    Instead of issuing one download per ticker, the tickers are split into
+    chunks of ``batch_size`` symbols and each chunk is fetched with a single
+    ``yfinance.download`` call grouped by ticker. Within a chunk every symbol
+    is requested concurrently, so ``batch_size`` also bounds the number of
+    open connections to Yahoo.
+
+    The download cache is shared with get_yahoo_data: tickers that are already
+    cached are not downloaded, and the others are cached after the download.
+
+    Args:
+        tickers: List of stock ticker symbols
+        start_date: Start date for data (YYYY-MM-DD string or datetime object)
+        end_date: End date for data (YYYY-MM-DD string or datetime object)
+                 If None, defaults to today's date
+        period: Time period for the data ('day', 'week' or '4h')
+        batch_size: Maximum number of symbols per request (clamped to 1-99)
+
+    Returns:
+        Dictionary mapping each ticker to a backtrader PandasData feed
+    """
+    import yfinance as yf
+
+    start_date = _as_datetime(start_date)
+    end_date = datetime.datetime.now() if end_date is None else _as_datetime(end_date)
+
+    interval = _YF_INTERVAL_MAP.get(period, "1d")
+    batch_size = max(1, min(batch_size, _MAX_BATCH_SIZE))
+
+    # Serve what we can from the cache and only download the rest
+    use_cache = not os.environ.get("STONKWISE_NO_CACHE") and _is_historical(end_date)
+    frames: Dict[str, "pd.DataFrame"] = {}
+    missing: List[str] = []
+    for ticker in dict.fromkeys(tickers):
+        cache_file = _cache_path(ticker, start_date, end_date, period)
+        if use_cache and cache_file.exists():
+            print(f"Loading {ticker} data from cache: {cache_file}")
+            frames[ticker] = _read_cache(str(cache_file), cache_file.stat().st_mtime_ns)
+        else:
+            missing.append(ticker)
+
+    for offset in range(0, len(missing), batch_size):
+        chunk = missing[offset : offset + batch_size]
+        print(f"Downloading {', '.join(chunk)} data from Yahoo Finance...")
+        chunk_df = yf.download(
+            tickers=chunk,
+            start=start_date,
+            end=end_date,
+            interval=interval,
+            group_by="ticker",
+            auto_adjust=True,
+            # One download thread per symbol, so the chunk finishes in roughly one
+            # round trip instead of waves of cpu_count * 2 requests
+            threads=len(chunk),
+            progress=False,
+        )
+
+        def finalize(ticker: str) -> "pd.DataFrame":
+            data_df = _prepare_frame(chunk_df, ticker, period)
+            if use_cache:
+                _write_cache(_cache_path(ticker, start_date, end_date, period), data_df)
+            return data_df
+
+        # Splitting, resampling and writing each ticker's cache file are independent,
+        # and pandas and pyarrow release the GIL for most of that work
+        if len(chunk) > 1:
+            with ThreadPoolExecutor(max_workers=min(_FINALIZE_THREADS, len(chunk))) as executor:
+                frames.update(zip(chunk, executor.map(finalize, chunk)))
+        else:
+            frames.update((ticker, finalize(ticker)) for ticker in chunk)
+
+    return {ticker: _to_feed(frames[ticker], period) for ticker in tickers}
+
+
+def _prepare_frame(data_df: "pd.DataFrame", ticker: str, period: str) -> "pd.DataFrame":
+    """
+    Normalize a yfinance download into a flat OHLCV DataFrame for one ticker.
+
+    Args:
+        data_df: DataFrame returned by ``yfinance.download``
+        ticker: Ticker whose columns should be extracted
+        period: Time period of the data ('day', 'week' or '4h')
+
+    Returns:
+        DataFrame with Open, High, Low, Close and Volume columns
+    """
+    import pandas as pd
+
+    # Reset the multi-level column headers that yfinance returns. Depending on
+    # the yfinance version and ``group_by`` the levels are either
+    # (Price, Ticker) or (Ticker, Price).
+    if isinstance(data_df.columns, pd.MultiIndex):
+        price_level = 0 if "Close" in data_df.columns.get_level_values(0) else 1
+        ticker_level = 1 - price_level
+        symbols = data_df.columns.unique(level=ticker_level)
+        # Yahoo reports symbols in upper case, so "msft" is returned as "MSFT"
+        matches = [symbol for symbol in symbols if str(symbol).casefold() == ticker.casefold()]
+        if matches:
+            data_df = cast(pd.DataFrame, data_df.xs(matches[0], axis=1, level=ticker_level))
+        elif len(symbols) == 1:
+            data_df = data_df.droplevel(ticker_level, axis=1)
+        else:
+            # The ticker is missing from a multi-ticker download; return no bars
+            # (which are never cached) rather than the other tickers' columns
+            empty = pd.DataFrame(columns=[*_PRICE_COLUMNS, "Volume"], index=data_df.index[:0])
+            return empty.astype({**{column: "float32" for column in _PRICE_COLUMNS}, "Volume": "int64"})
+
+        # Multi-ticker downloads share one index; drop the rows where this
+        # ticker did not trade
+        data_df = data_df.dropna(how="all")
+
     # Handle 4h period by resampling if needed
     # If we requested 4-hour data, we need to resample from the hourly data
     if period == "4h" and len(data_df) > 0:
         print("Resampling hourly data to 4-hour intervals...")
-        # Resample using pandas functionality
-        # For each 4-hour period:
-        # - Open: Use the first value in the period
-        # - High: Use the maximum value in the period
-        # - Low: Use the minimum value in the period
-        # - Close: Use the last value in the period
-        # - Volume: Sum all values in the period
-        data_df = (
-            data_df.resample("4H")
-            .agg(
-                {
-                    "Open": "first",  # First price in the interval
-                    "High": "max",  # Highest price in the interval
-                    "Low": "min",  # Lowest price in the interval
-                    "Close": "last",  # Last price in the interval
-                    "Volume": "sum",  # Total volume in the interval
-                }
-            )
-            .dropna()
-        )  # Remove any rows with NaN values
-
-    # Clean up the DataFrame to ensure it's in the right format for backtrader
-    # Reset the multi-level column headers that yfinance sometimes returns
-    if isinstance(data_df.columns, pd.MultiIndex):
-        data_df.columns = data_df.columns.droplevel(0)
-
-    # Ensure tmp directory exists for storing temporary CSV files
-    project_root = pathlib.Path(__file__).parent.parent.parent
-    tmp_dir = project_root / "tmp"
-    os.makedirs(tmp_dir, exist_ok=True)
-
-    # Save to a temporary CSV file in the project's tmp directory
-    # This is needed because GenericCSVData requires a file path
-    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-    temp_file = tmp_dir / f"{ticker}_{period}_{timestamp}.csv"
-
-    # Save the DataFrame to CSV, ensuring the date index is included
-    data_df.to_csv(temp_file)
-    print(f"Data saved to temporary file: {temp_file}")
-
-    # Create a backtrader data feed from the CSV file
-    # bt.feeds.GenericCSVData creates a backtrader data feed from a CSV file
-    data = bt.feeds.GenericCSVData(
-        dataname=str(temp_file),  # Path to the CSV file
-        dtformat="%Y-%m-%d",  # Format of date/time column
-        datetime=0,  # Column index for date/time (0 = first column)
-        open=1,  # Column index for Open price
-        high=2,  # Column index for High price
-        low=3,  # Column index for Low price
-        close=4,  # Column index for Close price
-        volume=5,  # Column index for Volume
-        openinterest=-1,  # No open interest data available (-1 means not used)
-    )
+        data_df = _resample_4h(data_df)
+
+    # Yahoo prices carry only a few significant digits, so float32 loses nothing
+    # and halves the memory the detectors and the cache have to move around.
+    # Volume stays int64: daily volumes of heavily traded tickers overflow int32.
+    price_columns = [column for column in _PRICE_COLUMNS if column in data_df.columns]
+    if price_columns:
+        data_df = data_df.astype({column: "float32" for column in price_columns})
+
+    return data_df
+
+
+def _resample_4h(data_df: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Aggregate hourly bars into 4-hour bars.
+
+    Equivalent to ``data_df.resample("4h").agg(...).dropna()``, but the bars are
+    grouped on an integer bucket number, which skips the resampler's bin index
+    and its empty bins. The buckets are the resampler's bins: 4-hour steps from
+    midnight of the first day.
+
+    For each 4-hour period:
+    - Open: the first value in the period
+    - High: the maximum value in the period
+    - Low: the minimum value in the period
+    - Close: the last value in the period
+    - Volume: the sum of the values in the period
+
+    Args:
+        data_df: Hourly OHLCV DataFrame indexed by datetime
+
+    Returns:
+        4-hour OHLCV DataFrame, without periods that have no complete bar
+    """
+    import pandas as pd
+
+    index = data_df.index
+    bucket_size = pd.Timedelta(hours=4)
+    origin = index.min().normalize()
+    buckets = (index - origin) // bucket_size
+
+    data_df = data_df.groupby(buckets).agg({"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"})
+    data_df.index = pd.DatetimeIndex(origin + data_df.index * bucket_size, name=index.name)
 
-    # Return the backtrader data feed
-    return data
+    # Remove any rows with NaN values
+    return data_df.dropna()
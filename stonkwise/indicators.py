@@ -0,0 +1,61 @@
+"""
+Custom backtrader indicators for stonkwise.
+
+This module contains indicators used by the stonkwise strategies where the
+backtrader built-ins do more work than needed.
+"""
+
+import math
+from array import array
+
+import backtrader as bt
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class FastSMA(bt.Indicator):
+    """
+    Simple moving average updated from a rolling sum.
+
+    Drop-in replacement for ``bt.indicators.SimpleMovingAverage``. The built-in
+    indicator sums the whole window again on every bar; this one adds the new
+    value and subtracts the one leaving the window, and only sums the window
+    again once per period (to stop rounding drift) or after a NaN, which would
+    otherwise stay in the running sum. In backtrader's vectorized (runonce) mode
+    the window sums are computed in NumPy, so a NaN only affects the windows
+    that contain it.
+    """
+
+    lines = ("sma",)
+    params = (("period", 30),)  # type: ignore
+    plotinfo = dict(subplot=False)
+
+    def __init__(self) -> None:
+        """Initialize the indicator's minimum period and rolling sum."""
+        self.addminperiod(self.p.period)
+        self._sum = 0.0
+
+    def nextstart(self) -> None:
+        """Sum the first full window exactly."""
+        self._sum = math.fsum(self.data.get(size=self.p.period))
+        self.lines.sma[0] = self._sum / self.p.period  # type: ignore[attr-defined]
+
+    def next(self) -> None:
+        """Slide the window forward by one bar."""
+        period = self.p.period
+        if len(self) % period == 0 or not math.isfinite(self._sum):
+            self._sum = math.fsum(self.data.get(size=period))
+        else:
+            self._sum += self.data[0] - self.data[-period]
+        self.lines.sma[0] = self._sum / period  # type: ignore[attr-defined]
+
+    def once(self, start: int, end: int) -> None:
+        """Compute the bars from start to end in one pass over the data buffer."""
+        period = self.p.period
+        src = np.frombuffer(self.data.array, dtype=np.float64)
+
+        # One sum per window over the needed range
+        averages = sliding_window_view(src[start - period + 1 : end], period).sum(axis=1) / period
+        del src
+
+        self.lines.sma.array[start:end] = array("d", averages.tobytes())  # type: ignore[attr-defined]
@@ -7,12 +7,22 @@ action, specifically by analyzing the sequence of highs
 and lows.
 """
 
+import functools
+import hashlib
+import logging
 from enum import Enum
-from typing import Dict, List, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from stonkwise._rolling import fast_rolling_max, fast_rolling_min
+from stonkwise.ohlcv import OHLCV
+from stonkwise.utils._njit import NUMBA_AVAILABLE, njit, prange
+
+# Detection diagnostics are debug logs, so hot backtest loops do no formatting or I/O by default
+logger = logging.getLogger(__name__)
+
 
 class TrendType(Enum):
     """Enum for trend types."""
@@ -36,6 +46,7 @@ class MarketStructureDetector:
         swing_lookback: int = 5,
         atr_swing_threshold_multiplier: float = 1.0,  # Multiplier for ATR to define swing significance
         trend_strength_threshold: float = 0.66,  # Min proportion of swings confirming trend (e.g. 0.66 for 2/3)
+        wilder_atr: bool = False,  # Smooth the ATR with Wilder's recursion instead of a simple mean
     ):
         """
         Initialize the market structure detector.
@@ -44,46 +55,110 @@ class MarketStructureDetector:
             swing_lookback: Number of bars to look back/forward for swing fractal detection.
             atr_swing_threshold_multiplier: ATR multiplier for swing significance.
             trend_strength_threshold: Proportion of recent swings that must confirm a trend.
+            wilder_atr: Use Wilder's smoothed ATR rather than the mean true range of the last period.
         """
         if not 0 < trend_strength_threshold <= 1:
             raise ValueError("trend_strength_threshold must be between 0 (exclusive) and 1 (inclusive)")
         self.swing_lookback = swing_lookback
         self.atr_swing_threshold_multiplier = atr_swing_threshold_multiplier
         self.trend_strength_threshold = trend_strength_threshold
+        self.wilder_atr = wilder_atr
 
-        # Store detected swings
-        self.swing_highs: List[Tuple[int, float]] = []  # (index, price)
-        self.swing_lows: List[Tuple[int, float]] = []  # (index, price)
+        # Store detected swings as parallel bar index and price arrays
+        self.swing_high_idx = np.empty(0, dtype=np.int64)
+        self.swing_high_prices = np.empty(0, dtype=np.float64)
+        self.swing_low_idx = np.empty(0, dtype=np.int64)
+        self.swing_low_prices = np.empty(0, dtype=np.float64)
 
         # Store current trend
         self.current_trend = TrendType.UNKNOWN
 
-    def detect_structure(self, data: pd.DataFrame) -> TrendType:
+        # Parameters and price fingerprint the stored swings and trend were detected with
+        self._detected_key: Optional[Tuple[int, float, float, bool, bytes]] = None
+
+        # (period, smoothing, price fingerprint) and ATR of the last ATR calculation
+        self._atr_cache: Optional[Tuple[Tuple[int, bool, bytes], float]] = None
+
+    @property
+    def swing_highs(self) -> List[Tuple[int, float]]:
+        """Detected swing highs as (index, price) tuples."""
+        return list(zip(self.swing_high_idx.tolist(), self.swing_high_prices.tolist()))
+
+    @property
+    def swing_lows(self) -> List[Tuple[int, float]]:
+        """Detected swing lows as (index, price) tuples."""
+        return list(zip(self.swing_low_idx.tolist(), self.swing_low_prices.tolist()))
+
+    @classmethod
+    @functools.lru_cache(maxsize=32)
+    def get(
+        cls,
+        swing_lookback: int = 5,
+        atr_swing_threshold_multiplier: float = 1.0,
+        trend_strength_threshold: float = 0.66,
+        wilder_atr: bool = False,
+    ) -> "MarketStructureDetector":
+        """
+        Get a shared detector for the given parameters.
+
+        Detectors are cached per parameter combination, so repeated callers reuse
+        one instance instead of constructing a new one each time. The shared
+        instance keeps the swings and trend of its last detection; call
+        ``detect_structure`` on the data before reading any results.
+
+        Args:
+            swing_lookback: Number of bars to look back/forward for swing fractal detection.
+            atr_swing_threshold_multiplier: ATR multiplier for swing significance.
+            trend_strength_threshold: Proportion of recent swings that must confirm a trend.
+            wilder_atr: Use Wilder's smoothed ATR rather than the mean true range of the last period.
+
+        Returns:
+            Cached MarketStructureDetector instance
+        """
+        return cls(swing_lookback, atr_swing_threshold_multiplier, trend_strength_threshold, wilder_atr)
+
+    def detect_structure(self, data: Union[pd.DataFrame, OHLCV]) -> TrendType:
         """
         Detect market structure from price data.
 
+        Calling this again with the same prices returns the stored result
+        without detecting the swings again.
+
         Args:
-            data: DataFrame with OHLC price data
+            data: DataFrame or OHLCV with OHLC price data
 
         Returns:
             Detected trend type (uptrend, downtrend, or range)
         """
-        # Reset stored swings
-        self.swing_highs = []
-        self.swing_lows = []
+        # Extract the price columns once; everything below works on plain NumPy arrays.
+        # Float64 arrays also keep the JIT-compiled swing scan type-stable.
+        highs, lows, closes = _price_arrays(data)
+
+        # Hashing the prices is much cheaper than detecting the swings again
+        key = (
+            self.swing_lookback,
+            self.atr_swing_threshold_multiplier,
+            self.trend_strength_threshold,
+            self.wilder_atr,
+            _fingerprint(highs, lows, closes),
+        )
+        if key == self._detected_key:
+            return self.current_trend
 
-        # Detect swing highs and lows
-        self._detect_swings(data)
+        # Detect swing highs and lows, using ATR with a common period like 14. The ATR is
+        # cached, so building zones from the same data afterwards does not compute it again.
+        self._detect_swings(highs, lows, closes, self._cached_atr(highs, lows, closes, period=14, fingerprint=key[-1]))
 
         # Analyze the sequence of swings to determine market structure
         trend = self._analyze_swings()
 
         # Store the current trend
         self.current_trend = trend
+        self._detected_key = key
 
         return trend
 
-    def _detect_swings(self, data: pd.DataFrame) -> None:
+    def _detect_swings(self, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, atr: float) -> None:
         """
         Detect swing highs and lows in the price data.
 
@@ -94,64 +169,124 @@ class MarketStructureDetector:
         Swings are then filtered based on ATR to ensure significance.
 
         Args:
-            data: DataFrame with OHLC price data
+            highs: Array of high prices
+            lows: Array of low prices
+            closes: Array of close prices
+            atr: Average true range of the prices
         """
+        # Reset stored swings
+        self.swing_high_idx = self.swing_low_idx = np.empty(0, dtype=np.int64)
+        self.swing_high_prices = self.swing_low_prices = np.empty(0, dtype=np.float64)
+
         # Ensure we have enough data for lookback periods on both sides
+        num_bars = len(highs)
         required_data_length = 2 * self.swing_lookback + 1
-        if len(data) < required_data_length:
-            print(f"Not enough data: {len(data)} bars, " f"need at least {required_data_length}")
+        if num_bars < required_data_length:
+            logger.debug("Not enough data: %d bars, need at least %d", num_bars, required_data_length)
             return
 
-        highs = data["High"].to_numpy()  # Convert to numpy array
-        lows = data["Low"].to_numpy()  # Convert to numpy array
-        close_prices = data["Close"].to_numpy()  # Use .to_numpy() for clarity
+        # A bar is a swing candidate when it is the extreme of the window [i-lookback, i+lookback]
+        # (>= / <= to catch plateaus), and candidates are kept when they are significant
+        # relative to ATR. Compiled, both steps run as one fused pass over the prices.
+        lookback = self.swing_lookback
+        threshold = self._swing_threshold(closes, atr)
+        if NUMBA_AVAILABLE:
+            swing_high_idx, swing_low_idx = _detect_swings_kernel(highs, lows, lookback, threshold)
+        else:
+            # The trailing rolling windows ending at i+lookback are exactly the centred windows
+            window = 2 * lookback + 1
+            centre = slice(lookback, num_bars - lookback)
+            high_candidates = np.zeros(num_bars, dtype=np.bool_)
+            low_candidates = np.zeros(num_bars, dtype=np.bool_)
+            high_candidates[centre] = highs[centre] >= fast_rolling_max(highs, window)[window - 1 :]
+            low_candidates[centre] = lows[centre] <= fast_rolling_min(lows, window)[window - 1 :]
+            swing_high_idx, swing_low_idx = _swing_scan_loop(highs, lows, high_candidates, low_candidates, threshold)
+        self._store_swings(highs, lows, swing_high_idx, swing_low_idx)
+
+    def _swing_threshold(self, closes: np.ndarray, atr: float) -> float:
+        """
+        Minimum price change between consecutive swings of a kind.
 
-        # Calculate ATR once for the whole dataset, using a common period like 14
-        atr = self._calculate_atr(data, period=14)
+        Args:
+            closes: Array of close prices
+            atr: Average true range of the prices
+
+        Returns:
+            ATR scaled by atr_swing_threshold_multiplier
+        """
         if atr <= 0:  # Handle cases where ATR might be zero or negative (e.g. flat price)
-            # Fallback to a small percentage of the average price if ATR is not usable
-            average_price = 1.0  # Default average price
-            if len(close_prices) > 0:
-                average_price = np.mean(close_prices)
-            atr = average_price * 0.001  # Default to 0.1% of avg price as min threshold base
+            # Fallback to a small percentage of the price if ATR is not usable. The data is
+            # flat or degenerate here, so the last close serves as well as a full-array mean.
+            reference_price = float(closes[-1]) if len(closes) > 0 else 1.0
+            atr = reference_price * 0.001  # Default to 0.1% of the price as min threshold base
             if atr <= 0:  # Ensure atr is positive
                 atr = 0.0001
+        return atr * self.atr_swing_threshold_multiplier
 
-        # For swing highs - find local maxima
-        for i in range(self.swing_lookback, len(data) - self.swing_lookback):
-            # Check if highs[i] is the maximum in the window [i-lookback, i+lookback]
-            window_highs = highs[i - self.swing_lookback : i + self.swing_lookback + 1]
-            if highs[i] >= np.max(window_highs):  # Using >= to catch plateaus
-                # Check if it's significantly different from the previous swing high using ATR
-                is_significant_swing = True
-                if self.swing_highs:
-                    price_diff = abs(highs[i] - self.swing_highs[-1][1])
-                    if price_diff < atr * self.atr_swing_threshold_multiplier:
-                        is_significant_swing = False
-
-                if is_significant_swing:
-                    self.swing_highs.append((i, highs[i]))
-
-        # For swing lows - find local minima
-        for i in range(self.swing_lookback, len(data) - self.swing_lookback):
-            # Check if lows[i] is the minimum in the window [i-lookback, i+lookback]
-            window_lows = lows[i - self.swing_lookback : i + self.swing_lookback + 1]
-            if lows[i] <= np.min(window_lows):  # Using <= to catch plateaus
-                # Check if it's significantly different from the previous swing low using ATR
-                is_significant_swing = True
-                if self.swing_lows:
-                    price_diff = abs(lows[i] - self.swing_lows[-1][1])
-                    if price_diff < atr * self.atr_swing_threshold_multiplier:
-                        is_significant_swing = False
-
-                if is_significant_swing:
-                    self.swing_lows.append((i, lows[i]))
-
-        print(
-            f"Detected {len(self.swing_highs)} swing highs and {len(self.swing_lows)} swing lows "
-            f"with lookback {self.swing_lookback}, ATR mult {self.atr_swing_threshold_multiplier}"
+    def _store_swings(self, highs: np.ndarray, lows: np.ndarray, swing_high_idx: np.ndarray, swing_low_idx: np.ndarray) -> None:
+        """
+        Store the swings at the given bar indices.
+
+        Args:
+            highs: Array of high prices
+            lows: Array of low prices
+            swing_high_idx: Bar indices of the swing highs
+            swing_low_idx: Bar indices of the swing lows
+        """
+        self.swing_high_idx, self.swing_high_prices = swing_high_idx, highs[swing_high_idx]
+        self.swing_low_idx, self.swing_low_prices = swing_low_idx, lows[swing_low_idx]
+
+        logger.debug(
+            "Detected %d swing highs and %d swing lows with lookback %d, ATR mult %s",
+            len(swing_high_idx),
+            len(swing_low_idx),
+            self.swing_lookback,
+            self.atr_swing_threshold_multiplier,
         )
 
+    def detect_structure_batch(self, data_by_symbol: Mapping[str, Union[pd.DataFrame, OHLCV]]) -> Dict[str, TrendType]:
+        """
+        Detect the market structure of several symbols at once.
+
+        With Numba installed, the swings of all symbols are found by one compiled
+        kernel that runs in parallel across symbols; otherwise each symbol is
+        detected in turn. Afterwards the detector holds the swings and trend of
+        the last symbol.
+
+        Args:
+            data_by_symbol: DataFrame or OHLCV with OHLC price data for each symbol
+
+        Returns:
+            Detected trend type for each symbol, in the order given
+        """
+        arrays = [_price_arrays(data) for data in data_by_symbol.values()]
+        atrs = [self._calculate_atr_arrays(highs, lows, closes, period=14) for highs, lows, closes in arrays]
+
+        if NUMBA_AVAILABLE and arrays:
+            # Concatenate the symbols; offsets[k]:offsets[k + 1] are the bars of symbol k
+            offsets = np.concatenate(([0], np.cumsum([len(closes) for _, _, closes in arrays]))).astype(np.int64)
+            thresholds = np.array([self._swing_threshold(closes, atr) for (_, _, closes), atr in zip(arrays, atrs)])
+            high_idx, high_counts, low_idx, low_counts = _batch_swings_kernel(
+                np.concatenate([highs for highs, _, _ in arrays]),
+                np.concatenate([lows for _, lows, _ in arrays]),
+                offsets,
+                self.swing_lookback,
+                thresholds,
+            )
+
+        trends = {}
+        for k, (symbol, (highs, lows, closes)) in enumerate(zip(data_by_symbol, arrays)):
+            if NUMBA_AVAILABLE:
+                start = offsets[k]
+                self._store_swings(highs, lows, high_idx[start : start + high_counts[k]], low_idx[start : start + low_counts[k]])
+            else:
+                self._detect_swings(highs, lows, closes, atrs[k])
+            trends[symbol] = self.current_trend = self._analyze_swings()
+
+        # The stored swings were not fingerprinted, so a later detect_structure call detects again
+        self._detected_key = None
+        return trends
+
     def _analyze_swings(self) -> TrendType:
         """
         Analyze the sequence of swing highs and lows to determine market structure
@@ -161,17 +296,18 @@ class MarketStructureDetector:
             Detected trend type (uptrend, downtrend, or range)
         """
         # If we don't have enough distinct swings for comparison, trend is unknown
-        if len(self.swing_highs) < 2 or len(self.swing_lows) < 2:
-            print(f"Not enough swings for trend analysis: {len(self.swing_highs)} highs, " f"{len(self.swing_lows)} lows")
+        if len(self.swing_high_prices) < 2 or len(self.swing_low_prices) < 2:
+            logger.debug("Not enough swings for trend analysis: %d highs, %d lows", len(self.swing_high_prices), len(self.swing_low_prices))
             return TrendType.UNKNOWN
 
         # Consider the last N swings for trend determination (e.g., last 3-4 pairs)
         num_recent_swings_to_consider = 3  # Check last 3 highs and 3 lows
-        recent_highs = self.swing_highs[-num_recent_swings_to_consider:]
-        recent_lows = self.swing_lows[-num_recent_swings_to_consider:]
+        # Plain floats compare faster than NumPy scalars in the short loops below
+        recent_highs = self.swing_high_prices[-num_recent_swings_to_consider:].tolist()
+        recent_lows = self.swing_low_prices[-num_recent_swings_to_consider:].tolist()
 
         if len(recent_highs) < 2 or len(recent_lows) < 2:  # Still need at least 2 of each for comparisons
-            print(f"Not enough RECENT swings for trend analysis: {len(recent_highs)} highs, " f"{len(recent_lows)} lows")
+            logger.debug("Not enough RECENT swings for trend analysis: %d highs, %d lows", len(recent_highs), len(recent_lows))
             return TrendType.UNKNOWN
 
         # --- Higher Highs and Higher Lows (Uptrend) ---
@@ -179,27 +315,27 @@ class MarketStructureDetector:
         comparisons_high = len(recent_highs) - 1
         if comparisons_high > 0:
             for i in range(1, len(recent_highs)):
-                if recent_highs[i][1] > recent_highs[i - 1][1]:
+                if recent_highs[i] > recent_highs[i - 1]:
                     higher_highs_count += 1
 
         higher_lows_count = 0
         comparisons_low = len(recent_lows) - 1
         if comparisons_low > 0:
             for i in range(1, len(recent_lows)):
-                if recent_lows[i][1] > recent_lows[i - 1][1]:
+                if recent_lows[i] > recent_lows[i - 1]:
                     higher_lows_count += 1
 
         # --- Lower Highs and Lower Lows (Downtrend) ---
         lower_highs_count = 0
         if comparisons_high > 0:
             for i in range(1, len(recent_highs)):
-                if recent_highs[i][1] < recent_highs[i - 1][1]:
+                if recent_highs[i] < recent_highs[i - 1]:
                     lower_highs_count += 1
 
         lower_lows_count = 0
         if comparisons_low > 0:
             for i in range(1, len(recent_lows)):
-                if recent_lows[i][1] < recent_lows[i - 1][1]:
+                if recent_lows[i] < recent_lows[i - 1]:
                     lower_lows_count += 1
 
         # --- Determine Trend based on Strength Threshold ---
@@ -216,15 +352,26 @@ class MarketStructureDetector:
         making_lower_highs = (lower_highs_count / comparisons_high >= self.trend_strength_threshold) if comparisons_high > 0 else False
         making_lower_lows = (lower_lows_count / comparisons_low >= self.trend_strength_threshold) if comparisons_low > 0 else False
 
-        # Print debug info
-        print(
-            f"HH: {higher_highs_count}/{comparisons_high}, HL: {higher_lows_count}/{comparisons_low} | "
-            f"LH: {lower_highs_count}/{comparisons_high}, LL: {lower_lows_count}/{comparisons_low}"
-        )
-        print(
-            f"Thresholds: HigherHighs: {making_higher_highs}, HigherLows: {making_higher_lows}, "
-            f"LowerHighs: {making_lower_highs}, LowerLows: {making_lower_lows}"
-        )
+        # Log debug info
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "HH: %d/%d, HL: %d/%d | LH: %d/%d, LL: %d/%d",
+                higher_highs_count,
+                comparisons_high,
+                higher_lows_count,
+                comparisons_low,
+                lower_highs_count,
+                comparisons_high,
+                lower_lows_count,
+                comparisons_low,
+            )
+            logger.debug(
+                "Thresholds: HigherHighs: %s, HigherLows: %s, LowerHighs: %s, LowerLows: %s",
+                making_higher_highs,
+                making_higher_lows,
+                making_lower_highs,
+                making_lower_lows,
+            )
 
         is_uptrend = making_higher_highs and making_higher_lows
         is_downtrend = making_lower_highs and making_lower_lows
@@ -237,12 +384,12 @@ class MarketStructureDetector:
             # This can happen if, e.g., strength threshold is low.
             # Could mean a volatile range or a transition.
             # More conservative: if any conflict, it's not a clear trend.
-            print("Conflicting trend signals based on threshold, classifying as RANGE")
+            logger.debug("Conflicting trend signals based on threshold, classifying as RANGE")
             return TrendType.RANGE
         else:  # Neither clear uptrend nor clear downtrend
             return TrendType.RANGE
 
-    def get_supply_demand_zones(self, data: pd.DataFrame) -> Dict[str, List[Dict[str, float]]]:
+    def get_supply_demand_zones(self, data: Union[pd.DataFrame, OHLCV]) -> Dict[str, List[Dict[str, float]]]:
         """
         Identify supply and demand zones based on market structure.
 
@@ -250,13 +397,13 @@ class MarketStructureDetector:
         In a downtrend, supply zones are formed at lower highs.
 
         Args:
-            data: DataFrame with OHLC price data
+            data: DataFrame or OHLCV with OHLC price data
 
         Returns:
             Dictionary with supply and demand zones
         """
         # Ensure we have detected market structure
-        if self.current_trend == TrendType.UNKNOWN:
+        if self.current_trend is TrendType.UNKNOWN:
             self.detect_structure(data)
 
         # Initialize zones
@@ -266,10 +413,10 @@ class MarketStructureDetector:
         atr = self._calculate_atr(data, period=14)
 
         # Identify zones based on market structure
-        if self.current_trend == TrendType.UPTREND:
+        if self.current_trend is TrendType.UPTREND:
             # In an uptrend, demand zones are at higher lows
-            for i in range(1, min(3, len(self.swing_lows))):
-                idx, price = self.swing_lows[-i]
+            for i in range(1, min(3, len(self.swing_low_prices))):
+                price = float(self.swing_low_prices[-i])
                 zones["demand"].append(
                     {
                         "price": price,
@@ -279,10 +426,10 @@ class MarketStructureDetector:
                     }
                 )
 
-        elif self.current_trend == TrendType.DOWNTREND:
+        elif self.current_trend is TrendType.DOWNTREND:
             # In a downtrend, supply zones are at lower highs
-            for i in range(1, min(3, len(self.swing_highs))):
-                idx, price = self.swing_highs[-i]
+            for i in range(1, min(3, len(self.swing_high_prices))):
+                price = float(self.swing_high_prices[-i])
                 zones["supply"].append(
                     {
                         "price": price,
@@ -295,8 +442,8 @@ class MarketStructureDetector:
         else:  # RANGE
             # In a range, both supply and demand zones can be identified
             # Supply zones at the upper range
-            for i in range(1, min(2, len(self.swing_highs))):
-                idx, price = self.swing_highs[-i]
+            for i in range(1, min(2, len(self.swing_high_prices))):
+                price = float(self.swing_high_prices[-i])
                 zones["supply"].append(
                     {
                         "price": price,
@@ -307,8 +454,8 @@ class MarketStructureDetector:
                 )
 
             # Demand zones at the lower range
-            for i in range(1, min(2, len(self.swing_lows))):
-                idx, price = self.swing_lows[-i]
+            for i in range(1, min(2, len(self.swing_low_prices))):
+                price = float(self.swing_low_prices[-i])
                 zones["demand"].append(
                     {
                         "price": price,
@@ -320,46 +467,93 @@ class MarketStructureDetector:
 
         return zones
 
-    def _calculate_atr(self, data: pd.DataFrame, period: int = 14) -> float:
+    def _calculate_atr(self, data: Union[pd.DataFrame, OHLCV], period: int = 14) -> float:
         """
         Calculate Average True Range (ATR) for determining zone width.
 
         Args:
-            data: DataFrame with OHLC price data
+            data: DataFrame or OHLCV with OHLC price data
             period: Period for ATR calculation
 
         Returns:
             ATR value. Returns a small positive value if calculation is not possible.
         """
-        if len(data) < 2:
-            return 0.0001  # Not enough data for TR calculation
+        return self._cached_atr(*_price_arrays(data), period)
+
+    def _cached_atr(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int, fingerprint: Optional[bytes] = None) -> float:
+        """
+        Calculate the ATR of price arrays, reusing the last result for the same prices.
+
+        The cache holds one entry keyed on the fingerprint of the prices, so
+        data that has grown or been edited in place is recalculated. Detecting
+        the structure and then building zones from the same data calculates
+        the ATR once.
+
+        Args:
+            high: Array of high prices
+            low: Array of low prices
+            close: Array of close prices
+            period: Period for ATR calculation
+            fingerprint: _fingerprint of the three arrays, if already computed
+
+        Returns:
+            ATR value. Returns a small positive value if calculation is not possible.
+        """
+        key = (period, self.wilder_atr, fingerprint if fingerprint is not None else _fingerprint(high, low, close))
+        if self._atr_cache is not None and self._atr_cache[0] == key:
+            return self._atr_cache[1]
+
+        atr = self._calculate_atr_arrays(high, low, close, period)
+        self._atr_cache = (key, atr)
+        return atr
+
+    def _calculate_atr_arrays(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> float:
+        """
+        Calculate Average True Range (ATR) from price arrays.
 
-        high = data["High"].to_numpy()
-        low = data["Low"].to_numpy()
-        close = data["Close"].to_numpy()
+        Args:
+            high: Array of high prices
+            low: Array of low prices
+            close: Array of close prices
+            period: Period for ATR calculation
 
-        # True Range components
-        tr1 = high[1:] - low[1:]
-        tr2 = np.abs(high[1:] - close[:-1])
-        tr3 = np.abs(low[1:] - close[:-1])
+        Returns:
+            ATR value. Returns a small positive value if calculation is not possible.
+        """
+        if len(close) < 2:
+            return 0.0001  # Not enough data for TR calculation
 
-        tr = np.maximum(np.maximum(tr1, tr2), tr3)
+        if self.wilder_atr and period > 0:
+            atr_value = _wilder_atr(high, low, close, period)
+            return atr_value if atr_value > 0 else 0.0001
+
+        # Only the last period true ranges are averaged, and each needs the previous close,
+        # so the work is bounded by the period rather than the length of the history
+        if 0 < period < len(close) - 1:
+            high, low, close = high[-(period + 1) :], low[-(period + 1) :], close[-(period + 1) :]
+
+        # True Range: the largest of high - low and the gaps of high and low from the
+        # previous close, built in place in two buffers
+        prev_close = close[:-1]
+        tr = high[1:] - low[1:]
+        gap = np.subtract(high[1:], prev_close)
+        np.abs(gap, out=gap)
+        np.maximum(tr, gap, out=tr)
+        np.subtract(low[1:], prev_close, out=gap)
+        np.abs(gap, out=gap)
+        np.maximum(tr, gap, out=tr)
 
         if len(tr) == 0:
-            average_price = 1.0
-            if len(close) > 0:
-                average_price = float(np.mean(close))  # Cast to float
-            calculated_atr = average_price * 0.001
+            reference_price = float(close[-1]) if len(close) > 0 else 1.0
+            calculated_atr = reference_price * 0.001
             return calculated_atr if calculated_atr > 0 else 0.0001
 
         # Calculate ATR as the simple moving average of true range for the defined period
         relevant_tr = tr[-period:]
 
         if len(relevant_tr) == 0:
-            average_price = 1.0
-            if len(close) > 0:
-                average_price = float(np.mean(close))  # Cast to float
-            calculated_atr = average_price * 0.001
+            reference_price = float(close[-1]) if len(close) > 0 else 1.0
+            calculated_atr = reference_price * 0.001
             return calculated_atr if calculated_atr > 0 else 0.0001
 
         atr_value = float(np.mean(relevant_tr))  # Cast to float
@@ -367,58 +561,299 @@ class MarketStructureDetector:
         return atr_value if atr_value > 0 else 0.0001  # Ensure ATR is positive
 
 
+def _price_arrays(data: Union[pd.DataFrame, OHLCV]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Get the high, low and close prices of a DataFrame or OHLCV as float64 arrays.
+
+    Args:
+        data: DataFrame or OHLCV with OHLC price data
+
+    Returns:
+        Tuple of (highs, lows, closes)
+    """
+    if isinstance(data, OHLCV):
+        return (np.asarray(data.high, dtype=np.float64), np.asarray(data.low, dtype=np.float64), np.asarray(data.close, dtype=np.float64))
+    return tuple(data[column].to_numpy(dtype=np.float64) for column in ("High", "Low", "Close"))  # type: ignore[return-value]
+
+
+def _fingerprint(*arrays: np.ndarray) -> bytes:
+    """
+    Hash the contents of price arrays.
+
+    Args:
+        arrays: Float64 price arrays
+
+    Returns:
+        Digest identifying the prices
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for values in arrays:
+        digest.update(len(values).to_bytes(8, "little"))
+        digest.update(np.ascontiguousarray(values).data)
+    return digest.digest()
+
+
+@njit(cache=True)
+def _wilder_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> float:
+    """
+    Wilder's average true range at the last bar, in one pass without temporaries.
+
+    The first ``period`` true ranges are averaged to seed the ATR, then each
+    later one is folded in as ``atr = (atr * (period - 1) + tr) / period``.
+    Inputs with fewer than ``period`` true ranges return their mean.
+
+    Args:
+        high: Array of high prices
+        low: Array of low prices
+        close: Array of close prices (at least two bars)
+        period: Smoothing period
+
+    Returns:
+        ATR value
+    """
+    n = len(close)
+    seed = min(period, n - 1)
+    atr = 0.0
+    for i in range(1, n):
+        tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        if i <= seed:
+            atr += tr
+            if i == seed:
+                atr /= seed
+        else:
+            atr = (atr * (period - 1) + tr) / period
+    return atr
+
+
+@njit(cache=True)
+def _swing_scan_loop(
+    highs: np.ndarray, lows: np.ndarray, high_candidates: np.ndarray, low_candidates: np.ndarray, threshold: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Filter swing candidates down to the significant swing highs and lows.
+
+    A candidate is only kept when it differs from the previously kept swing of
+    the same kind by at least ``threshold``. The filter is sequential, so
+    it runs as a compiled loop.
+
+    Args:
+        highs: Array of high prices
+        lows: Array of low prices
+        high_candidates: Boolean mask of bars that are local maxima
+        low_candidates: Boolean mask of bars that are local minima
+        threshold: Minimum price change between consecutive swings of a kind
+
+    Returns:
+        Tuple of (swing high indices, swing low indices) as int64 arrays
+    """
+    n = len(highs)
+    high_idx = np.empty(n, dtype=np.int64)
+    low_idx = np.empty(n, dtype=np.int64)
+    n_highs = 0
+    n_lows = 0
+
+    # Check if each swing high is significantly different from the previous one using ATR
+    for i in range(n):
+        if high_candidates[i] and (n_highs == 0 or not abs(highs[i] - highs[high_idx[n_highs - 1]]) < threshold):
+            high_idx[n_highs] = i
+            n_highs += 1
+
+    # Same for swing lows
+    for i in range(n):
+        if low_candidates[i] and (n_lows == 0 or not abs(lows[i] - lows[low_idx[n_lows - 1]]) < threshold):
+            low_idx[n_lows] = i
+            n_lows += 1
+
+    return high_idx[:n_highs], low_idx[:n_lows]
+
+
+@njit(cache=True)
+def _detect_swings_kernel(highs: np.ndarray, lows: np.ndarray, lookback: int, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the significant swing highs and lows in a single pass over the prices.
+
+    Fuses the centred rolling extrema and the ATR significance filter of
+    _swing_scan_loop: bar ``i`` is decided once bar ``i + lookback`` has been
+    read, with the window maxima and minima kept in monotonic deques (see
+    stonkwise._rolling). Windows containing NaN yield no candidate, like the
+    rolling path.
+
+    Args:
+        highs: Array of high prices
+        lows: Array of low prices
+        lookback: Number of bars on each side of a swing
+        threshold: Minimum price change between consecutive swings of a kind
+
+    Returns:
+        Tuple of (swing high indices, swing low indices) as int64 arrays
+    """
+    n = len(highs)
+    window = 2 * lookback + 1
+    high_idx = np.empty(n, dtype=np.int64)
+    low_idx = np.empty(n, dtype=np.int64)
+    n_highs = 0
+    n_lows = 0
+
+    # Ring buffers of indices whose values can still be the window's extreme
+    max_deque = np.empty(window, dtype=np.int64)
+    min_deque = np.empty(window, dtype=np.int64)
+    max_head = 0
+    max_tail = 0
+    min_head = 0
+    min_tail = 0
+    last_nan_high = -window
+    last_nan_low = -window
+
+    for j in range(n):
+        # Drop the heads that have left the window ending at j
+        if max_tail > max_head and max_deque[max_head % window] <= j - window:
+            max_head += 1
+        if min_tail > min_head and min_deque[min_head % window] <= j - window:
+            min_head += 1
+
+        high = highs[j]
+        if np.isnan(high):
+            last_nan_high = j
+        else:
+            while max_tail > max_head and highs[max_deque[(max_tail - 1) % window]] <= high:
+                max_tail -= 1
+            max_deque[max_tail % window] = j
+            max_tail += 1
+
+        low = lows[j]
+        if np.isnan(low):
+            last_nan_low = j
+        else:
+            while min_tail > min_head and lows[min_deque[(min_tail - 1) % window]] >= low:
+                min_tail -= 1
+            min_deque[min_tail % window] = j
+            min_tail += 1
+
+        if j < window - 1:
+            continue
+
+        # The window ending at j is centred on i
+        i = j - lookback
+        if j - last_nan_high >= window and highs[i] >= highs[max_deque[max_head % window]]:
+            if n_highs == 0 or not abs(highs[i] - highs[high_idx[n_highs - 1]]) < threshold:
+                high_idx[n_highs] = i
+                n_highs += 1
+        if j - last_nan_low >= window and lows[i] <= lows[min_deque[min_head % window]]:
+            if n_lows == 0 or not abs(lows[i] - lows[low_idx[n_lows - 1]]) < threshold:
+                low_idx[n_lows] = i
+                n_lows += 1
+
+    return high_idx[:n_highs], low_idx[:n_lows]
+
+
+@njit(cache=True, parallel=True)
+def _batch_swings_kernel(
+    highs: np.ndarray, lows: np.ndarray, offsets: np.ndarray, lookback: int, thresholds: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run _detect_swings_kernel on each of several concatenated symbols, in parallel.
+
+    Args:
+        highs: High prices of all symbols, concatenated
+        lows: Low prices of all symbols, concatenated
+        offsets: Start of each symbol's bars, followed by the total length
+        lookback: Number of bars on each side of a swing
+        thresholds: Swing significance threshold of each symbol
+
+    Returns:
+        Tuple of (swing high indices, swing high counts, swing low indices, swing low counts).
+        The swings of symbol k are stored from offsets[k], indexed from its first bar.
+    """
+    num_symbols = len(thresholds)
+    high_idx = np.empty(len(highs), dtype=np.int64)
+    low_idx = np.empty(len(lows), dtype=np.int64)
+    high_counts = np.zeros(num_symbols, dtype=np.int64)
+    low_counts = np.zeros(num_symbols, dtype=np.int64)
+    for k in prange(num_symbols):
+        start = offsets[k]
+        stop = offsets[k + 1]
+        symbol_highs, symbol_lows = _detect_swings_kernel(highs[start:stop], lows[start:stop], lookback, thresholds[k])
+        high_idx[start : start + len(symbol_highs)] = symbol_highs
+        low_idx[start : start + len(symbol_lows)] = symbol_lows
+        high_counts[k] = len(symbol_highs)
+        low_counts[k] = len(symbol_lows)
+    return high_idx, high_counts, low_idx, low_counts
+
+
 def detect_market_structure(
-    data: pd.DataFrame,
+    data: Union[pd.DataFrame, OHLCV],
     swing_lookback: int = 5,
     atr_swing_threshold_multiplier: float = 1.0,
     trend_strength_threshold: float = 0.66,
+    wilder_atr: bool = False,
 ) -> TrendType:
     """
     Detect market structure from price data.
 
     Args:
-        data: DataFrame with OHLC price data
+        data: DataFrame or OHLCV with OHLC price data
         swing_lookback: Number of bars to look back for swing detection.
         atr_swing_threshold_multiplier: ATR multiplier for swing significance.
         trend_strength_threshold: Proportion of recent swings that must confirm a trend.
+        wilder_atr: Use Wilder's smoothed ATR rather than the mean true range of the last period.
 
     Returns:
         Detected trend type (uptrend, downtrend, or range)
     """
-    detector = MarketStructureDetector(
-        swing_lookback=swing_lookback,
-        atr_swing_threshold_multiplier=atr_swing_threshold_multiplier,
-        trend_strength_threshold=trend_strength_threshold,
-    )
+    detector = MarketStructureDetector.get(swing_lookback, atr_swing_threshold_multiplier, trend_strength_threshold, wilder_atr)
 
     return detector.detect_structure(data)
 
 
+def detect_market_structure_batch(
+    data_by_symbol: Mapping[str, Union[pd.DataFrame, OHLCV]],
+    swing_lookback: int = 5,
+    atr_swing_threshold_multiplier: float = 1.0,
+    trend_strength_threshold: float = 0.66,
+    wilder_atr: bool = False,
+) -> Dict[str, TrendType]:
+    """
+    Detect the market structure of several symbols, in parallel when Numba is installed.
+
+    Args:
+        data_by_symbol: DataFrame or OHLCV with OHLC price data for each symbol
+        swing_lookback: Number of bars to look back for swing detection.
+        atr_swing_threshold_multiplier: ATR multiplier for swing significance.
+        trend_strength_threshold: Proportion of recent swings that must confirm a trend.
+        wilder_atr: Use Wilder's smoothed ATR rather than the mean true range of the last period.
+
+    Returns:
+        Detected trend type (uptrend, downtrend, or range) for each symbol
+    """
+    detector = MarketStructureDetector.get(swing_lookback, atr_swing_threshold_multiplier, trend_strength_threshold, wilder_atr)
+
+    return detector.detect_structure_batch(data_by_symbol)
+
+
 def get_supply_demand_zones(
-    data: pd.DataFrame,
+    data: Union[pd.DataFrame, OHLCV],
     swing_lookback: int = 5,
     atr_swing_threshold_multiplier: float = 1.0,
     trend_strength_threshold: float = 0.66,  # Added for consistency if detector is reused
+    wilder_atr: bool = False,
 ) -> Dict[str, List[Dict[str, float]]]:
     """
     Identify supply and demand zones based on market structure.
 
     Args:
-        data: DataFrame with OHLC price data
+        data: DataFrame or OHLCV with OHLC price data
         swing_lookback: Number of bars to look back for swing detection.
         atr_swing_threshold_multiplier: ATR multiplier for swing significance.
         trend_strength_threshold: Proportion of recent swings that must confirm a trend.
+        wilder_atr: Use Wilder's smoothed ATR rather than the mean true range of the last period.
 
     Returns:
         Dictionary with supply and demand zones
     """
-    detector = MarketStructureDetector(
-        swing_lookback=swing_lookback,
-        atr_swing_threshold_multiplier=atr_swing_threshold_multiplier,
-        trend_strength_threshold=trend_strength_threshold,
-    )
-
-    # Market structure detection will be called within get_supply_demand_zones if needed
-    # detector.detect_structure(data) # This is implicitly called by get_supply_demand_zones
+    detector = MarketStructureDetector.get(swing_lookback, atr_swing_threshold_multiplier, trend_strength_threshold, wilder_atr)
+
+    # The shared detector may still hold the trend of earlier data, so always detect
+    # the structure of this data before building zones from it
+    detector.detect_structure(data)
 
     return detector.get_supply_demand_zones(data)
@@ -0,0 +1,72 @@
+"""
+Columnar OHLCV container for stonkwise.
+
+This module provides a light structure-of-arrays alternative to a pandas
+DataFrame for handing price bars to the analysis code.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(slots=True)
+class OHLCV:
+    """
+    OHLCV bars stored as one NumPy array per field.
+
+    Attributes:
+        open: Open prices
+        high: High prices
+        low: Low prices
+        close: Close prices
+        volume: Volumes
+        ts: Bar timestamps (datetime64)
+    """
+
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    ts: np.ndarray
+
+    def __len__(self) -> int:
+        """Return the number of bars."""
+        return len(self.close)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "OHLCV":
+        """
+        Create an OHLCV from a DataFrame with Open, High, Low, Close and Volume columns.
+
+        The columns are taken as float64 arrays, without copying columns that
+        already have that dtype.
+
+        Args:
+            df: DataFrame with OHLCV data indexed by datetime
+
+        Returns:
+            OHLCV with the DataFrame's bars
+        """
+        return cls(
+            open=df["Open"].to_numpy(dtype=np.float64),
+            high=df["High"].to_numpy(dtype=np.float64),
+            low=df["Low"].to_numpy(dtype=np.float64),
+            close=df["Close"].to_numpy(dtype=np.float64),
+            volume=df["Volume"].to_numpy(dtype=np.float64),
+            ts=df.index.to_numpy(),
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Convert the bars to a DataFrame indexed by timestamp.
+
+        Returns:
+            DataFrame with Open, High, Low, Close and Volume columns
+        """
+        return pd.DataFrame(
+            {"Open": self.open, "High": self.high, "Low": self.low, "Close": self.close, "Volume": self.volume},
+            index=pd.DatetimeIndex(self.ts),
+        )
@@ -5,24 +5,32 @@ This module provides functionality for plotting historical price data
 with various customization options.
 """
 
+import contextlib
 import datetime
 import os
 import pathlib
-from typing import List, Optional
+from concurrent.futures import as_completed
+from typing import TYPE_CHECKING, Any, ContextManager, Dict, List, Optional, Union
 
-import backtrader as bt
-import matplotlib.pyplot as plt
-import numpy as np
 import pandas as pd
 
-from stonkwise.data_sources import get_yahoo_data
+from stonkwise.utils.paths import tmp_dir, unique_path
+from stonkwise.utils.runner import default_dates, prefetch, worker_pool
+
+# backtrader, matplotlib and the data sources are imported inside the functions
+# that need them, so importing this module does not load the plotting stack
+if TYPE_CHECKING:
+    import backtrader as bt
+
+# Columns the file loaders hand to the data feed
+_OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
 
 
 def plot_tickers(
     tickers: List[str],
     period: str = "day",
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    start_date: Optional[Union[str, datetime.datetime]] = None,
+    end_date: Optional[Union[str, datetime.datetime]] = None,
     input_file: Optional[str] = None,
     output_path: Optional[str] = None,
     show_ma: bool = False,
@@ -32,42 +40,74 @@ def plot_tickers(
     """
     Plot historical price data for one or more tickers.
 
+    Each ticker's plot is independent, so with more than one ticker the plots
+    are rendered in parallel worker processes (matplotlib and backtrader are not
+    safe to share between threads). Downloads happen in a background thread of
+    this process, a few tickers ahead of the workers.
+
     Args:
         tickers: List of stock ticker symbols
         period: Time period ('day', 'week', or '4h')
-        start_date: Start date for plotting (YYYY-MM-DD), defaults to 1 year ago
-        end_date: End date for plotting (YYYY-MM-DD), defaults to today
+        start_date: Start date for plotting (YYYY-MM-DD or datetime), defaults to 1 year ago
+        end_date: End date for plotting (YYYY-MM-DD or datetime), defaults to today
         input_file: Path to input CSV or Parquet file (instead of Yahoo Finance)
         output_path: Path to save the plot (defaults to tmp directory)
         show_ma: Whether to show moving averages on the plot
         show_trend: Whether to show trend direction on the plot
         show_zones: Whether to show supply and demand zones on the plot
     """
-    for ticker in tickers:
-        print(f"\nPlotting {ticker}...")
-        plot_ticker(
-            ticker=ticker,
-            period=period,
-            start_date=start_date,
-            end_date=end_date,
-            input_file=input_file,
-            output_path=output_path,
-            show_ma=show_ma,
-            show_trend=show_trend,
-            show_zones=show_zones,
-        )
+    options = {
+        "period": period,
+        "start_date": start_date,
+        "end_date": end_date,
+        "input_file": input_file,
+        "output_path": output_path,
+        "show_ma": show_ma,
+        "show_trend": show_trend,
+        "show_zones": show_zones,
+    }
+
+    if len(tickers) <= 1:
+        for ticker in tickers:
+            _plot_one(ticker, options)
+        return
+
+    # Resolve the default dates once so the downloads and the workers agree on them
+    options["start_date"], options["end_date"] = default_dates(start_date, end_date)
+
+    max_workers = min(len(tickers), os.cpu_count() or 1)
+    with worker_pool(max_workers) as executor:
+        # Each plot is submitted as soon as its bars have been downloaded
+        futures = [executor.submit(_plot_one, ticker, options, data) for ticker, data in prefetch(tickers, options, max_workers)]
+        for future in as_completed(futures):
+            # Re-raise any error from the worker
+            future.result()
+
+
+def _plot_one(ticker: str, options: Dict[str, Any], data: Optional[pd.DataFrame] = None) -> None:
+    """
+    Plot a single ticker, used as the worker for plot_tickers.
+
+    Args:
+        ticker: Stock ticker symbol
+        options: Keyword arguments for plot_ticker
+        data: Pre-fetched OHLCV DataFrame, if any
+    """
+    print(f"\nPlotting {ticker}...")
+    plot_ticker(ticker=ticker, data=data, **options)
 
 
 def plot_ticker(
     ticker: str,
     period: str = "day",
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    start_date: Optional[Union[str, datetime.datetime]] = None,
+    end_date: Optional[Union[str, datetime.datetime]] = None,
     input_file: Optional[str] = None,
     output_path: Optional[str] = None,
     show_ma: bool = False,
     show_trend: bool = False,
     show_zones: bool = False,
+    data: Optional[pd.DataFrame] = None,
 ) -> None:
     """
     Plot historical price data for a single ticker.
@@ -75,25 +115,30 @@ def plot_ticker(
     Args:
         ticker: Stock ticker symbol
         period: Time period ('day', 'week', or '4h')
-        start_date: Start date for plotting (YYYY-MM-DD), defaults to 1 year ago
-        end_date: End date for plotting (YYYY-MM-DD), defaults to today
+        start_date: Start date for plotting (YYYY-MM-DD or datetime), defaults to 1 year ago
+        end_date: End date for plotting (YYYY-MM-DD or datetime), defaults to today
         input_file: Path to input CSV or Parquet file (instead of Yahoo Finance)
         output_path: Path to save the plot (defaults to tmp directory)
         show_ma: Whether to show moving averages on the plot
         show_trend: Whether to show trend direction on the plot
         show_zones: Whether to show supply and demand zones on the plot
+        data: Pre-fetched OHLCV DataFrame from the data source; loaded from
+            input_file or Yahoo Finance if not provided
     """
     # Set default dates if not provided
-    if start_date is None:
-        start_date = (datetime.datetime.now() - datetime.timedelta(days=365)).strftime("%Y-%m-%d")
-    if end_date is None:
-        end_date = datetime.datetime.now().strftime("%Y-%m-%d")
+    start_date, end_date = default_dates(start_date, end_date)
+
+    import backtrader as bt
 
     # Create a cerebro entity
     cerebro = bt.Cerebro()
 
-    # Get data from file or Yahoo Finance
-    if input_file:
+    # Get data from the pre-fetched bars, a file or Yahoo Finance
+    if data is not None:
+        from stonkwise.data_sources.yahoo import _to_feed
+
+        data = _to_feed(data, period)
+    elif input_file:
         # Determine file type from extension
         if input_file.endswith(".csv"):
             data = load_csv_data(input_file)
@@ -102,6 +147,8 @@ def plot_ticker(
         else:
             raise ValueError(f"Unsupported file format: {input_file}")
     else:
+        from stonkwise.data_sources import get_yahoo_data
+
         # Get data from Yahoo Finance
         data = get_yahoo_data(ticker, start_date, end_date, period)
 
@@ -132,46 +179,27 @@ def plot_ticker(
         )
         sma200.plotlines.sma.color = "red"
 
-    # Get the data as a pandas DataFrame for market structure analysis
-    df = None
+    # Add trend detection and supply/demand zones if requested
+    zones = None
     if show_trend or show_zones:
-        # Run cerebro once to load the data
-        cerebro.run()
-
-        # Convert data to pandas DataFrame
-        df = pd.DataFrame()
-        df["Open"] = np.array(data.open)
-        df["High"] = np.array(data.high)
-        df["Low"] = np.array(data.low)
-        df["Close"] = np.array(data.close)
-        df["Volume"] = np.array(data.volume)
-        df.index = pd.to_datetime([data.num2date(x) for x in data.datetime])
-
-    # Add trend detection if requested
-    trend = None
-    if show_trend and df is not None:
         # Import here to avoid circular imports
         from stonkwise.market_structure import MarketStructureDetector
+        from stonkwise.utils.feeds import feed_to_dataframe
+
+        # The feed wraps a DataFrame, so its bars are read directly; cerebro
+        # only runs once, right before plotting
+        df = feed_to_dataframe(data)
 
-        # Create a detector and analyze the data
+        # Detect the structure once and derive the zones from the same swings
         detector = MarketStructureDetector()
         trend = detector.detect_structure(df)
 
-        print(f"Detected market structure: {trend.value}")
-
-    # Add supply/demand zones if requested
-    zones = None
-    if show_zones and df is not None:
-        # Import here to avoid circular imports
-        from stonkwise.market_structure import MarketStructureDetector
-
-        # Create a detector and analyze the data
-        detector = MarketStructureDetector()
-        if trend is None:
-            detector.detect_structure(df)
-        zones = detector.get_supply_demand_zones(df)
+        if show_trend:
+            print(f"Detected market structure: {trend.value}")
 
-        print(f"Detected {len(zones['supply'])} supply zones and {len(zones['demand'])} demand zones")
+        if show_zones:
+            zones = detector.get_supply_demand_zones(df)
+            print(f"Detected {len(zones['supply'])} supply zones and {len(zones['demand'])} demand zones")
 
     # Run the backtest (required for plotting)
     cerebro.run()
@@ -190,7 +218,7 @@ def plot_ticker(
 
 
 def create_plot(
-    cerebro: bt.Cerebro,
+    cerebro: "bt.Cerebro",
     ticker: str,
     period: str,
     strategy: str = "analysis",
@@ -217,19 +245,24 @@ def create_plot(
     Returns:
         Path to the saved plot
     """
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    # Plots are only ever saved to files, so render off-screen with Agg
+    matplotlib.use("Agg")
+
     # Plot the result without blocking
     # Set show=False to prevent the plot from blocking execution
     # Use style='bar' to ensure proper coloring of up/down days
-    fig = cerebro.plot(
+    figs = cerebro.plot(
         style="bar",
         barup="green",
         bardown="red",
         volup="green",
         voldown="red",
         show=False,
-    )[
-        0
-    ][0]
+    )
+    fig = figs[0][0]
 
     # TODO: Add visualization of zones if provided
     if zones:
@@ -238,71 +271,101 @@ def create_plot(
         pass
 
     # Determine output path for the plot
+    file_name = f"{ticker}_{period}_{strategy}_{datetime.datetime.now():%Y%m%d%H%M%S}_plot.png"
+    target: ContextManager[pathlib.Path]
     if output_path is None:
         # Save to a file in the tmp directory
-        project_root = pathlib.Path(__file__).parent.parent.parent
-        tmp_dir = project_root / "tmp"
-        os.makedirs(tmp_dir, exist_ok=True)
-
-        timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-        plot_path = tmp_dir / f"{ticker}_{period}_{strategy}_{timestamp}_plot.png"
+        target = unique_path(tmp_dir() / file_name)
     else:
         # Use the provided output path for the plot
         plot_path = pathlib.Path(output_path)
 
         # If it's a directory, create a file name
-        if plot_path.is_dir():
-            timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-            plot_path = plot_path / f"{ticker}_{period}_{strategy}_{timestamp}_plot.png"
+        target = unique_path(plot_path / file_name) if plot_path.is_dir() else contextlib.nullcontext(plot_path)
 
     # Save the plot
-    fig.savefig(plot_path)
+    with target as plot_path:
+        fig.savefig(plot_path)
 
-    # Close the figure to free up memory
-    plt.close(fig)
+    # Close every figure cerebro created (one list per strategy) so they are
+    # not kept alive by pyplot's figure registry across tickers
+    for strategy_figs in figs:
+        for strategy_fig in strategy_figs:
+            plt.close(strategy_fig)
 
     return str(plot_path)
 
 
-def load_csv_data(file_path: str) -> bt.feeds.GenericCSVData:
+def load_csv_data(file_path: str) -> "bt.feeds.PandasData":
     """
     Load data from a CSV file.
 
+    The file is expected to hold a date column followed by Open, High, Low,
+    Close and Volume columns, in that order. It is parsed with pandas (Arrow
+    engine) instead of backtrader's row-by-row CSV reader. The parsed frame is
+    also written to a ``<file>.parquet.cache`` sidecar, which is reused on the
+    next load for as long as the CSV has not been modified.
+
     Args:
         file_path: Path to the CSV file
 
     Returns:
         backtrader data feed object
     """
+    csv_path = pathlib.Path(file_path)
+    cache_path = csv_path.with_name(csv_path.name + ".parquet.cache")
+
+    # Reuse the Parquet copy if it is at least as new as the CSV
+    if cache_path.exists() and cache_path.stat().st_mtime >= csv_path.stat().st_mtime:
+        return _df_to_feed(pd.read_parquet(cache_path))
+
     # TODO: Implement CSV loading with proper column detection
     # For now, we'll assume a standard format
-    return bt.feeds.GenericCSVData(
-        dataname=file_path,
-        dtformat="%Y-%m-%d",
-        datetime=0,
-        open=1,
-        high=2,
-        low=3,
-        close=4,
-        volume=5,
-        openinterest=-1,
-    )
+    df = pd.read_csv(csv_path, engine="pyarrow", index_col=0, parse_dates=[0])
+    df = df.iloc[:, :5]
+    df.columns = _OHLCV_COLUMNS
+
+    try:
+        df.to_parquet(cache_path, compression="zstd")
+    except OSError:
+        # Read-only location; just parse the CSV again next time
+        pass
 
+    return _df_to_feed(df)
 
-def load_parquet_data(file_path: str) -> bt.feeds.PandasData:
+
+def load_parquet_data(file_path: str) -> "bt.feeds.PandasData":
     """
     Load data from a Parquet file.
 
+    Only the Open, High, Low, Close and Volume columns (and the stored index)
+    are read, so any other columns in a wide file are never decoded.
+
     Args:
         file_path: Path to the Parquet file
 
     Returns:
         backtrader data feed object
     """
-    # Load the parquet file into a pandas DataFrame
-    df = pd.read_parquet(file_path)
+    # Load the OHLCV columns of the parquet file into a pandas DataFrame
+    df = pd.read_parquet(file_path, columns=_OHLCV_COLUMNS)
 
     # Create a backtrader data feed from the DataFrame
+    return _df_to_feed(df)
+
+
+def _df_to_feed(df: pd.DataFrame) -> "bt.feeds.PandasData":
+    """
+    Create a backtrader data feed from an OHLCV DataFrame indexed by datetime.
+
+    Args:
+        df: DataFrame with Open, High, Low, Close and Volume columns
+
+    Returns:
+        backtrader data feed object
+    """
+    import backtrader as bt
+
     return bt.feeds.PandasData(
         dataname=df,
         datetime=None,  # Use the index as datetime
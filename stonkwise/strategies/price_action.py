@@ -34,12 +34,14 @@ class PriceActionStrategy(bt.Strategy):
         ("swing_lookback", 5),  # Lookback for swing detection
         ("atr_swing_threshold_multiplier", 1.0),  # ATR multiplier for swing significance
         ("trend_strength_threshold", 0.66),  # Proportion of swings confirming trend
+        ("wilder_atr", False),  # Smooth the structure ATR with Wilder's recursion
         # Zone parameters
         ("zone_buffer_atr_mult", 1.0),  # ATR multiplier for zone width
         ("max_zones_to_track", 3),  # Maximum number of zones to track
         ("zone_strength_threshold", 0.5),  # Minimum zone strength to consider
         # Pattern parameters
         ("engulfing_threshold", 0.01),  # Minimum engulfing percentage
+        ("hammer_score_threshold", None),  # Analytic hammer/shooting star score cut-off (None: ratio rules)
         ("require_pattern_confirmation", True),  # Whether to require pattern confirmation
         ("allowed_patterns", ["bullish_engulfing", "bearish_engulfing"]),  # Patterns to use
         # Risk management parameters
@@ -66,10 +68,12 @@ class PriceActionStrategy(bt.Strategy):
             swing_lookback=self.p.swing_lookback,
             atr_swing_threshold_multiplier=self.p.atr_swing_threshold_multiplier,
             trend_strength_threshold=self.p.trend_strength_threshold,
+            wilder_atr=self.p.wilder_atr,
         )
 
         self.pattern_detector = PatternDetector(
             engulfing_threshold=self.p.engulfing_threshold,
+            hammer_score_threshold=self.p.hammer_score_threshold,
         )
 
         # Strategy state
@@ -448,10 +452,10 @@ class PriceActionStrategy(bt.Strategy):
             return
 
         # Check trend alignment
-        if zone_type == "demand" and self.current_trend == TrendType.DOWNTREND:
+        if zone_type == "demand" and self.current_trend is TrendType.DOWNTREND:
             # Counter-trend trade in downtrend - be more cautious
             self.log("Demand zone retest in downtrend - counter-trend trade")
-        elif zone_type == "supply" and self.current_trend == TrendType.UPTREND:
+        elif zone_type == "supply" and self.current_trend is TrendType.UPTREND:
             # Counter-trend trade in uptrend - be more cautious
             self.log("Supply zone retest in uptrend - counter-trend trade")
 
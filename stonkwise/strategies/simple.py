@@ -6,6 +6,8 @@ from typing import Optional
 
 import backtrader as bt
 
+from stonkwise.indicators import FastSMA
+
 
 class SimpleStrategy(bt.Strategy):
     """
@@ -33,19 +35,19 @@ class SimpleStrategy(bt.Strategy):
         self.dataclose = self.datas[0].close
 
         # Create the moving average indicators
-        self.sma_fast = bt.indicators.SimpleMovingAverage(
+        self.sma_fast = FastSMA(  # type: ignore[call-arg]
             self.dataclose,
             period=self.params.fast_period,
             plotname=f"SMA({self.params.fast_period})",
         )
 
-        self.sma_mid = bt.indicators.SimpleMovingAverage(
+        self.sma_mid = FastSMA(  # type: ignore[call-arg]
             self.dataclose,
             period=self.params.mid_period,
             plotname=f"SMA({self.params.mid_period})",
         )
 
-        self.sma_slow = bt.indicators.SimpleMovingAverage(
+        self.sma_slow = FastSMA(  # type: ignore[call-arg]
             self.dataclose,
             period=self.params.slow_period,
             plotname=f"SMA({self.params.slow_period})",
@@ -2,6 +2,30 @@
 Utility functions and helpers for the stonkwise library.
 """
 
-from .plotting import customize_plot, save_plot
+import importlib
+from typing import Any
 
-__all__ = ["customize_plot", "save_plot"]
+__all__ = ["customize_plot", "save_plot", "tmp_dir"]
+
+# Module providing each public name; it is only imported when the name is first
+# accessed, so the submodules (e.g. _njit) can be used without loading matplotlib
+_LAZY_EXPORTS = {
+    "customize_plot": ".plotting",
+    "save_plot": ".plotting",
+    "tmp_dir": ".paths",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the utility module that provides name on first access (PEP 562)."""
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    # Cache it so later lookups skip this function
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """List the lazy exports along with the module's own attributes."""
+    return sorted(set(globals()) | set(__all__))
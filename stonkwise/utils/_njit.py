@@ -0,0 +1,55 @@
+"""
+Optional Numba JIT support.
+
+Numba is an optional dependency. When it is installed, ``njit`` and ``prange``
+are re-exported from it; otherwise ``njit`` becomes a no-op decorator and
+``prange`` falls back to ``range`` so the decorated functions still run as
+plain Python.
+"""
+
+from typing import TYPE_CHECKING, Any, Callable, TypeVar, overload
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+if TYPE_CHECKING:
+    # Type checkers see njit as a decorator that keeps the signature of the wrapped
+    # function, so calls to compiled functions are checked like plain Python calls
+    NUMBA_AVAILABLE: bool
+    prange = range
+
+    @overload
+    def njit(func: _F, /) -> _F:
+        ...
+
+    @overload
+    def njit(**options: Any) -> Callable[[_F], _F]:
+        ...
+
+    def njit(*args: Any, **kwargs: Any) -> Any:
+        """Compile a function with Numba, or return it unchanged without Numba."""
+
+else:
+    try:
+        from numba import njit, prange
+
+        NUMBA_AVAILABLE = True
+    except ImportError:  # pragma: no cover - depends on the environment
+        NUMBA_AVAILABLE = False
+        prange = range
+
+        def njit(*args: Any, **kwargs: Any) -> Any:
+            """
+            No-op replacement for ``numba.njit``.
+
+            Supports both the bare ``@njit`` and the ``@njit(...)`` forms.
+            """
+            if len(args) == 1 and callable(args[0]) and not kwargs:
+                return args[0]
+
+            def decorator(func: _F) -> _F:
+                return func
+
+            return decorator
+
+
+__all__ = ["NUMBA_AVAILABLE", "njit", "prange"]
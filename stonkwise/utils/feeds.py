@@ -0,0 +1,130 @@
+"""
+Conversion of backtrader data feeds to plain OHLCV bars.
+"""
+
+from typing import TYPE_CHECKING, Dict, Optional, cast
+
+# backtrader, NumPy and pandas are imported inside the functions that need them,
+# so importing this module stays cheap
+if TYPE_CHECKING:
+    import backtrader as bt
+    import numpy as np
+    import pandas as pd
+
+    from stonkwise.ohlcv import OHLCV
+
+# backtrader day number of 1970-01-01 (datetime.date(1970, 1, 1).toordinal())
+_EPOCH_DAY_NUMBER = 719163
+
+
+def feed_to_dataframe(data: "bt.feeds.DataBase") -> "pd.DataFrame":
+    """
+    Get the OHLCV bars of a data feed as a DataFrame.
+
+    Pandas-backed feeds already hold a DataFrame with a DatetimeIndex, so its
+    columns are used directly. Other feeds (e.g. CSV) are loaded through
+    feed_to_ohlcv.
+
+    Args:
+        data: backtrader data feed
+
+    Returns:
+        DataFrame with Open, High, Low, Close and Volume columns indexed by datetime
+    """
+    columns = _pandas_feed_columns(data)
+    if columns is not None:
+        df = cast("pd.DataFrame", data.p.dataname)[list(columns.values())]
+        df.columns = list(columns)
+        return df
+
+    return feed_to_ohlcv(data).to_dataframe()
+
+
+def feed_to_ohlcv(data: "bt.feeds.DataBase") -> "OHLCV":
+    """
+    Get the OHLCV bars of a data feed as NumPy arrays.
+
+    Pandas-backed feeds with a DatetimeIndex hand over their columns (without a
+    copy when they are float64). Other feeds (e.g. CSV) are loaded by running
+    them through a bare cerebro without strategies or analyzers, and their line
+    buffers are viewed in place.
+
+    Args:
+        data: backtrader data feed
+
+    Returns:
+        OHLCV with the feed's bars
+    """
+    import backtrader as bt
+    import numpy as np
+
+    from stonkwise.ohlcv import OHLCV
+
+    columns = _pandas_feed_columns(data)
+    if columns is not None:
+        df = cast("pd.DataFrame", data.p.dataname)
+        open_, high, low, close, volume = (df[column].to_numpy(dtype=np.float64) for column in columns.values())
+        return OHLCV(open_, high, low, close, volume, ts=df.index.to_numpy())
+
+    # Load the feed without running any strategy logic
+    loader = bt.Cerebro(stdstats=False)
+    loader.adddata(data)
+    loader.run()
+
+    open_, high, low, close, volume = (
+        np.frombuffer(line.array, dtype=np.float64) for line in (data.open, data.high, data.low, data.close, data.volume)
+    )
+    ts = _num2date_index(np.frombuffer(data.datetime.array, dtype=np.float64)).to_numpy()
+    return OHLCV(open_, high, low, close, volume, ts)
+
+
+def _pandas_feed_columns(data: "bt.feeds.DataBase") -> Optional[Dict[str, str]]:
+    """
+    Get the OHLCV column names of a pandas feed that uses its index as datetime.
+
+    Args:
+        data: backtrader data feed
+
+    Returns:
+        Mapping of Open/High/Low/Close/Volume to the feed's column names, or None
+        if the feed's bars cannot be read from its DataFrame directly
+    """
+    import backtrader as bt
+
+    if not isinstance(data, bt.feeds.PandasData) or data.p.datetime is not None:
+        return None
+    columns = {"Open": data.p.open, "High": data.p.high, "Low": data.p.low, "Close": data.p.close, "Volume": data.p.volume}
+    if not all(isinstance(column, str) for column in columns.values()):
+        return None
+    return columns
+
+
+def _num2date_index(day_numbers: "np.ndarray") -> "pd.DatetimeIndex":
+    """
+    Convert backtrader float day numbers to a DatetimeIndex in one vectorized pass.
+
+    Mirrors ``backtrader.num2date`` step by step (including its truncation and
+    rounding compensation) so the result matches converting bar by bar.
+
+    Args:
+        day_numbers: Float day numbers as stored in a feed's datetime line
+
+    Returns:
+        Naive DatetimeIndex
+    """
+    import numpy as np
+    import pandas as pd
+
+    days = np.floor(day_numbers)
+    hour, remainder = np.divmod(24.0 * (day_numbers - days), 1)
+    minute, remainder = np.divmod(60.0 * remainder, 1)
+    second, remainder = np.divmod(60.0 * remainder, 1)
+    microsecond = np.trunc(1e6 * remainder).astype(np.int64)
+    microsecond[microsecond < 10] = 0  # compensate for rounding errors
+    # Values just below the next second are rounded up to it
+    microsecond = np.where(microsecond > 999990, 1_000_000, microsecond)
+
+    seconds = (
+        (days.astype(np.int64) - _EPOCH_DAY_NUMBER) * 86400 + hour.astype(np.int64) * 3600 + minute.astype(np.int64) * 60 + second.astype(np.int64)
+    )
+    return pd.DatetimeIndex(pd.to_datetime(seconds * 1_000_000 + microsecond, unit="us"))
@@ -0,0 +1,60 @@
+"""
+Filesystem locations used by stonkwise.
+"""
+
+import contextlib
+import functools
+import pathlib
+from typing import Iterator
+
+# Default output directory for plots and results, next to the project directory
+TMP_DIR = pathlib.Path(__file__).resolve().parents[3] / "tmp"
+
+
+@functools.lru_cache(maxsize=None)
+def tmp_dir() -> pathlib.Path:
+    """
+    Get the default output directory, creating it on first use.
+
+    The directory is only created once per process instead of on every plot.
+
+    Returns:
+        Path to the tmp directory
+    """
+    TMP_DIR.mkdir(parents=True, exist_ok=True)
+    return TMP_DIR
+
+
+@contextlib.contextmanager
+def unique_path(path: pathlib.Path) -> Iterator[pathlib.Path]:
+    """
+    Reserve a file name that is not in use yet for the duration of a write.
+
+    Generated output names carry a timestamp with one-second resolution, so
+    two runs in the same second (e.g. a batch of tickers or a test suite)
+    would overwrite each other's files. The name is reserved by creating the
+    file exclusively, which also holds across processes; if it is taken,
+    ``_1``, ``_2``, ... is appended to the stem. If the block raises, the
+    reserved file is removed again so no empty output is left behind.
+
+    Args:
+        path: Preferred file path
+
+    Yields:
+        Path of a newly created, empty file to write the output to
+    """
+    candidate = path
+    attempt = 0
+    while True:
+        try:
+            with open(candidate, "x"):
+                break
+        except FileExistsError:
+            attempt += 1
+            candidate = path.with_name(f"{path.stem}_{attempt}{path.suffix}")
+
+    try:
+        yield candidate
+    except BaseException:
+        candidate.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,205 @@
+"""
+Helpers shared by the backtester, the analyzer and the plotter.
+
+These set up a single run (default dates, cerebro) and feed tickers to the
+worker processes of a batch.
+"""
+
+import datetime
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# backtrader, pandas, the strategies and the data sources are imported inside the
+# functions that need them, so importing this module stays cheap
+if TYPE_CHECKING:
+    import backtrader as bt
+    import pandas as pd
+
+# Tickers per Yahoo request when downloading ahead of the workers (Yahoo's cap
+# for a single multi-symbol request)
+_PREFETCH_BATCH = 20
+
+# Name of the stonkwise.strategies class for each strategy name; unknown names fall
+# back to SimpleStrategy
+_STRATEGY_MAP: Dict[str, str] = {
+    "simple": "SimpleStrategy",
+    # This will be implemented later
+    "ma_cross": "SimpleStrategy",
+    "price_action": "PriceActionStrategy",
+}
+
+# backtrader analyzer class registered for each metric name
+_ANALYZERS: Dict[str, str] = {
+    "sharpe": "SharpeRatio",
+    "drawdown": "DrawDown",
+    "returns": "Returns",
+    "trades": "TradeAnalyzer",
+}
+
+# Names of all metrics, computed by default
+METRICS: Tuple[str, ...] = tuple(_ANALYZERS)
+
+
+def default_dates(
+    start_date: Optional[Union[str, datetime.datetime]], end_date: Optional[Union[str, datetime.datetime]]
+) -> Tuple[Union[str, datetime.datetime], Union[str, datetime.datetime]]:
+    """
+    Fill in the default backtest window.
+
+    The defaults are datetimes (midnight today, like a YYYY-MM-DD string) so they
+    are passed through to the data source without being formatted and parsed again.
+
+    Args:
+        start_date: Start date (YYYY-MM-DD or datetime), defaults to 1 year ago
+        end_date: End date (YYYY-MM-DD or datetime), defaults to today
+
+    Returns:
+        Tuple of (start_date, end_date)
+    """
+    today = datetime.datetime.combine(datetime.date.today(), datetime.time())
+    if start_date is None:
+        start_date = today - datetime.timedelta(days=365)
+    if end_date is None:
+        end_date = today
+    return start_date, end_date
+
+
+def build_cerebro(strategy: str, cash: float, commission: float, stdstats: bool = False, analyzers: Iterable[str] = METRICS) -> "bt.Cerebro":
+    """
+    Build a cerebro with the strategy, broker settings and analyzers registered.
+
+    Default observers are left out unless requested: they are only needed for
+    plotting and update on every bar. A new instance is built per ticker:
+    cerebro keeps its strategies, feeds and broker state in mutable members, so
+    a shared template would leak state between runs.
+
+    Args:
+        strategy: Trading strategy name (see _STRATEGY_MAP)
+        cash: Starting cash for the broker
+        commission: Commission rate for trades
+        stdstats: Whether to add backtrader's default observers
+        analyzers: Metric names (see METRICS) whose analyzers are registered
+
+    Returns:
+        Configured Cerebro instance without data
+    """
+    import backtrader as bt
+
+    from stonkwise import strategies
+
+    cerebro = bt.Cerebro(stdstats=stdstats)
+    cerebro.addstrategy(getattr(strategies, _STRATEGY_MAP.get(strategy, "SimpleStrategy")))
+
+    # Set our desired cash start and the commission
+    cerebro.broker.setcash(cash)
+    cerebro.broker.setcommission(commission=commission)
+
+    # Add the analyzers, named after their metric
+    for metric in check_metrics(analyzers):
+        cerebro.addanalyzer(getattr(bt.analyzers, _ANALYZERS[metric]), _name=metric)
+    return cerebro
+
+
+def check_metrics(metrics: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Validate metric names.
+
+    Args:
+        metrics: Metric names
+
+    Returns:
+        The metric names as a tuple, without duplicates and in METRICS order
+
+    Raises:
+        ValueError: If a metric name is unknown
+    """
+    metrics = set(metrics)
+    unknown = metrics.difference(METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))} (expected some of {', '.join(METRICS)})")
+    return tuple(metric for metric in METRICS if metric in metrics)
+
+
+def prefetch(tickers: List[str], options: Dict[str, Any], depth: int) -> Iterator[Tuple[str, Optional["pd.DataFrame"]]]:
+    """
+    Yield each ticker with its downloaded bars, downloading ahead in a background thread.
+
+    The tickers are downloaded in batches of _PREFETCH_BATCH, one multi-ticker
+    request per batch, so the first workers start after a single round trip. Requests
+    run one at a time: yfinance keeps per-download state in module globals, so
+    concurrent download() calls in one process are not safe. At most ``depth``
+    downloaded tickers wait to be consumed. With an input file there is nothing
+    to download and the workers load the file themselves.
+
+    Args:
+        tickers: List of stock ticker symbols
+        options: Keyword arguments for the per-ticker function (e.g. backtest_ticker)
+        depth: Maximum number of downloaded tickers waiting to be consumed
+
+    Yields:
+        Tuples of (ticker, DataFrame or None)
+    """
+    if options["input_file"]:
+        for ticker in tickers:
+            yield ticker, None
+        return
+
+    from stonkwise.data_sources import get_yahoo_data_batch
+
+    downloaded: "queue.Queue[Tuple[str, Optional[pd.DataFrame], Optional[BaseException]]]" = queue.Queue(maxsize=depth)
+
+    def download() -> None:
+        for offset in range(0, len(tickers), _PREFETCH_BATCH):
+            chunk = tickers[offset : offset + _PREFETCH_BATCH]
+            try:
+                feeds = get_yahoo_data_batch(chunk, options["start_date"], options["end_date"], options["period"])
+            except BaseException as error:  # handed to the consumer and re-raised there
+                downloaded.put((chunk[0], None, error))
+                return
+            for ticker in chunk:
+                downloaded.put((ticker, feeds[ticker].p.dataname, None))
+
+    threading.Thread(target=download, name="stonkwise-prefetch", daemon=True).start()
+
+    for _ in tickers:
+        ticker, data, error = downloaded.get()
+        if error is not None:
+            raise error
+        yield ticker, data
+
+
+def worker_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Create the process pool that runs one ticker per task.
+
+    Workers are spawned rather than forked: forking a process in which Numba has
+    run a parallel kernel on its default (TBB) threading layer leaves it hanging
+    on exit, and spawning keeps that fix out of Numba's process-wide settings.
+    Each worker is prepared by init_worker.
+
+    Args:
+        max_workers: Number of worker processes
+
+    Returns:
+        ProcessPoolExecutor to use as a context manager
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"), initializer=init_worker)
+
+
+def init_worker() -> None:
+    """
+    Prepare a backtest worker process.
+
+    Forces the off-screen Agg backend so workers never touch a GUI toolkit, and
+    imports the heavy modules once per worker instead of once per ticker.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+    import backtrader  # noqa: F401
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
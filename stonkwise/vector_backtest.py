@@ -0,0 +1,285 @@
+"""
+Vectorized backtesting module for stonkwise.
+
+This module provides a NumPy (and, when installed, Numba) fast path for
+strategies whose signals can be computed from whole price arrays at once. It
+avoids backtrader's bar-by-bar event loop, which makes it suitable for sweeps
+over many tickers or parameters, at the cost of plots and the full backtrader
+analyzer output.
+"""
+
+from typing import Callable, Dict, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from stonkwise.utils._njit import njit, prange
+
+# Trading days per year, used to annualise returns and the Sharpe ratio
+_TRADING_DAYS = 252
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Calculate a simple moving average.
+
+    Args:
+        values: Input values
+        period: Moving average period
+
+    Returns:
+        Array the same length as values, NaN until period values are available
+    """
+    result = np.full(len(values), np.nan)
+    if len(values) >= period:
+        result[period - 1 :] = np.convolve(values, np.ones(period) / period, mode="valid")
+    return result
+
+
+def simple_strategy_signals(df: pd.DataFrame, fast_period: int = 50, slow_period: int = 200) -> np.ndarray:
+    """
+    Compute the entry and exit signals of SimpleStrategy.
+
+    A buy signal is raised when the fast SMA crosses above the slow SMA (golden
+    cross) and a sell signal when it crosses below (death cross). Like
+    backtrader's CrossOver indicator, bars where both averages are equal do not
+    reset the side the fast average was last on.
+
+    Args:
+        df: DataFrame with OHLCV data
+        fast_period: Fast moving average period
+        slow_period: Slow moving average period
+
+    Returns:
+        Array with 1 for buy signals, -1 for sell signals and 0 otherwise
+    """
+    close = df["Close"].to_numpy(dtype=np.float64)
+    diff = sma(close, fast_period) - sma(close, slow_period)
+
+    # Carry the last non-zero difference forward over ties
+    nonzero = np.where(np.isnan(diff) | (diff == 0), 0, np.arange(len(diff)))
+    last_nonzero = diff[np.maximum.accumulate(nonzero)]
+
+    signals = np.zeros(len(close), dtype=np.int8)
+    signals[1:][(last_nonzero[:-1] < 0) & (diff[1:] > 0)] = 1
+    signals[1:][(last_nonzero[:-1] > 0) & (diff[1:] < 0)] = -1
+    return signals
+
+
+# Strategies that can run on the vectorized path, keyed by strategy name
+VECTORIZABLE: Dict[str, Callable[[pd.DataFrame], np.ndarray]] = {
+    "simple": simple_strategy_signals,
+    "ma_cross": simple_strategy_signals,
+}
+
+
+def run_vector(
+    df: pd.DataFrame,
+    strategy_fn: Callable[[pd.DataFrame], np.ndarray],
+    initial_cash: float = 10000.0,
+    commission: float = 0.001,
+    size: float = 1.0,
+) -> Dict[str, Union[float, int]]:
+    """
+    Backtest a long-only signal strategy with NumPy instead of backtrader.
+
+    Orders are filled like backtrader market orders: a signal on one bar is
+    filled at the next bar's open, for a fixed number of units (backtrader's
+    default sizer buys a single unit). Buy signals while in the market and sell
+    signals while flat are ignored.
+
+    Args:
+        df: DataFrame with OHLCV data
+        strategy_fn: Function returning buy (1) / sell (-1) signals for df
+        initial_cash: Initial cash for backtesting
+        commission: Commission rate for trades
+        size: Number of units bought per trade
+
+    Returns:
+        Dictionary with backtest results, with the same keys as backtest_ticker
+    """
+    open_ = df["Open"].to_numpy(dtype=np.float64)
+    close = df["Close"].to_numpy(dtype=np.float64)
+    num_bars = len(close)
+
+    signals = np.ascontiguousarray(strategy_fn(df), dtype=np.int8)
+    equity, fill_bars, fill_sides = _simulate(open_, close, signals, initial_cash, commission, size)
+
+    final_value = float(equity[-1]) if num_bars else initial_cash
+
+    # Returns, using log returns like backtrader's Returns analyzer
+    total_return = float(np.log(final_value / initial_cash))
+    annual_return = float(np.expm1(total_return * _TRADING_DAYS / num_bars)) if num_bars else 0.0
+
+    daily_returns = np.diff(equity) / equity[:-1]
+    std = daily_returns.std() if len(daily_returns) else 0.0
+    sharpe_ratio = float(daily_returns.mean() / std * np.sqrt(_TRADING_DAYS)) if std > 0 else 0.0
+
+    # Max drawdown in percent, like backtrader's DrawDown analyzer
+    peak = np.maximum.accumulate(equity)
+    max_drawdown = float(((peak - equity) / peak).max() * 100.0) if num_bars else 0.0
+
+    # Pair each entry with its exit to get the closed trades' profit and loss
+    entries = fill_bars[fill_sides > 0]
+    exits = fill_bars[fill_sides < 0]
+    entry_cost = open_[entries[: len(exits)]] * size * (1 + commission)
+    exit_proceeds = open_[exits] * size * (1 - commission)
+    pnl = exit_proceeds - entry_cost
+
+    total_trades = len(entries)
+    won_trades = int((pnl > 0).sum())
+    lost_trades = int((pnl <= 0).sum())
+    win_rate = won_trades / total_trades if total_trades > 0 else 0.0
+
+    return {
+        "initial_value": initial_cash,
+        "final_value": final_value,
+        "total_return": total_return,
+        "annual_return": annual_return,
+        "sharpe_ratio": sharpe_ratio,
+        "max_drawdown": max_drawdown,
+        "total_trades": total_trades,
+        "won_trades": won_trades,
+        "lost_trades": lost_trades,
+        "win_rate": win_rate,
+    }
+
+
+def sweep_sma_crossover(
+    df: pd.DataFrame,
+    fast_periods: Sequence[int],
+    slow_periods: Sequence[int],
+    initial_cash: float = 10000.0,
+    commission: float = 0.001,
+    size: float = 1.0,
+) -> pd.DataFrame:
+    """
+    Backtest SimpleStrategy for every combination of fast and slow SMA periods.
+
+    The grid is evaluated in a single compiled kernel, in parallel across
+    combinations when Numba is installed.
+
+    Args:
+        df: DataFrame with OHLCV data
+        fast_periods: Fast moving average periods to try
+        slow_periods: Slow moving average periods to try
+        initial_cash: Initial cash for backtesting
+        commission: Commission rate for trades
+        size: Number of units bought per trade
+
+    Returns:
+        DataFrame with fast_period, slow_period and final_value columns, one row per combination
+    """
+    fast_grid, slow_grid = np.meshgrid(np.asarray(fast_periods, dtype=np.int64), np.asarray(slow_periods, dtype=np.int64), indexing="ij")
+    fast = fast_grid.ravel()
+    slow = slow_grid.ravel()
+
+    final_values = _sweep_kernel(
+        df["Open"].to_numpy(dtype=np.float64),
+        df["Close"].to_numpy(dtype=np.float64),
+        fast,
+        slow,
+        initial_cash,
+        commission,
+        size,
+    )
+    return pd.DataFrame({"fast_period": fast, "slow_period": slow, "final_value": final_values})
+
+
+@njit(cache=True)
+def _simulate(
+    open_: np.ndarray, close: np.ndarray, signals: np.ndarray, initial_cash: float, commission: float, size: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simulate long-only fills for buy/sell signals, one bar at a time.
+
+    A signal fills at the next bar's open; buy signals while long and sell
+    signals while flat are ignored.
+
+    Returns:
+        Tuple of (equity at each close, fill bar indices, fill sides)
+    """
+    num_bars = len(close)
+    equity = np.empty(num_bars)
+    fill_bars = np.empty(num_bars, dtype=np.int64)
+    fill_sides = np.empty(num_bars, dtype=np.int8)
+    num_fills = 0
+
+    cash = initial_cash
+    position = 0.0
+    pending = 0
+    for i in range(num_bars):
+        if pending != 0:
+            value = pending * size * open_[i]
+            cash -= value + abs(value) * commission
+            position += pending * size
+            fill_bars[num_fills] = i
+            fill_sides[num_fills] = pending
+            num_fills += 1
+            pending = 0
+
+        if signals[i] > 0 and position == 0.0:
+            pending = 1
+        elif signals[i] < 0 and position > 0.0:
+            pending = -1
+
+        equity[i] = cash + position * close[i]
+
+    return equity, fill_bars[:num_fills], fill_sides[:num_fills]
+
+
+@njit(cache=True)
+def _crossover_signals(close: np.ndarray, fast_period: int, slow_period: int) -> np.ndarray:
+    """
+    Compiled equivalent of simple_strategy_signals for the sweep kernel.
+
+    Returns:
+        Array with 1 for buy signals, -1 for sell signals and 0 otherwise
+    """
+    num_bars = len(close)
+    signals = np.zeros(num_bars, dtype=np.int8)
+    if num_bars < max(fast_period, slow_period):
+        return signals
+
+    cumulative = np.empty(num_bars + 1)
+    cumulative[0] = 0.0
+    for i in range(num_bars):
+        cumulative[i + 1] = cumulative[i] + close[i]
+
+    last_nonzero = 0.0
+    for i in range(max(fast_period, slow_period) - 1, num_bars):
+        fast = (cumulative[i + 1] - cumulative[i + 1 - fast_period]) / fast_period
+        slow = (cumulative[i + 1] - cumulative[i + 1 - slow_period]) / slow_period
+        diff = fast - slow
+        if last_nonzero < 0 and diff > 0:
+            signals[i] = 1
+        elif last_nonzero > 0 and diff < 0:
+            signals[i] = -1
+        if diff != 0:
+            last_nonzero = diff
+
+    return signals
+
+
+@njit(cache=True, parallel=True)
+def _sweep_kernel(
+    open_: np.ndarray,
+    close: np.ndarray,
+    fast_periods: np.ndarray,
+    slow_periods: np.ndarray,
+    initial_cash: float,
+    commission: float,
+    size: float,
+) -> np.ndarray:
+    """
+    Final portfolio value of SimpleStrategy for each (fast, slow) period pair.
+
+    Returns:
+        Array of final values, one per period pair
+    """
+    final_values = np.empty(len(fast_periods))
+    for k in prange(len(fast_periods)):
+        signals = _crossover_signals(close, fast_periods[k], slow_periods[k])
+        equity = _simulate(open_, close, signals, initial_cash, commission, size)[0]
+        final_values[k] = equity[-1] if len(equity) else initial_cash
+    return final_values
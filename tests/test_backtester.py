@@ -0,0 +1,133 @@
+"""
+Tests for the backtester module.
+"""
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+from assertpy import assert_that
+
+from stonkwise import data_sources
+from stonkwise.backtester import backtest_ticker, backtest_tickers, export_batch_results
+from stonkwise.data_sources.yahoo import _to_feed
+from stonkwise.utils.runner import build_cerebro
+from stonkwise.vector_backtest import run_vector, simple_strategy_signals
+
+_RESULTS = {
+    "MSFT": {"initial_value": 10000.0, "final_value": 10500.0, "total_trades": 3},
+    "AMZN": {"initial_value": 10000.0, "final_value": 9800.0, "total_trades": 1},
+}
+
+
+class TestExportResults:
+    """Test cases for writing backtest results."""
+
+    def test_batch_written_to_single_parquet_file(self, tmp_path):
+        """Test that all tickers end up as rows of one zstd Parquet file."""
+        export_batch_results(_RESULTS, "simple", str(tmp_path))
+
+        files = list(tmp_path.glob("batch_simple_*_results.parquet"))
+        assert_that(files).is_length(1)
+        df = pd.read_parquet(files[0])
+        assert_that(df["ticker"].tolist()).is_equal_to(["MSFT", "AMZN"])
+        assert_that(df["final_value"].tolist()).is_equal_to([10500.0, 9800.0])
+
+    def test_exports_in_the_same_second_do_not_overwrite(self, tmp_path):
+        """Test that every export gets its own file even when the timestamps collide."""
+        export_batch_results(_RESULTS, "simple", str(tmp_path))
+        export_batch_results(_RESULTS, "simple", str(tmp_path))
+        export_batch_results(_RESULTS, "simple", str(tmp_path))
+
+        assert_that(list(tmp_path.glob("batch_simple_*.parquet"))).is_length(3)
+
+    def test_csv_format(self, tmp_path):
+        """Test that CSV output is still available on request."""
+        export_batch_results(_RESULTS, "simple", str(tmp_path), results_format="csv")
+
+        files = list(tmp_path.glob("*.csv"))
+        assert_that(files).is_length(1)
+        assert_that(pd.read_csv(files[0])).is_length(2)
+
+    @pytest.mark.parametrize("file_name,magic", [("out_results.csv", b"initial_value"), ("out_results.parquet", b"PAR1")])
+    def test_format_follows_file_extension(self, tmp_path, file_name, magic):
+        """Test that a named output file is written in the format its extension implies."""
+        output_path = tmp_path / file_name
+        export_batch_results(_RESULTS, "simple", str(output_path))
+
+        assert_that(output_path.read_bytes()[: len(magic)]).is_equal_to(magic)
+
+    def test_format_contradicting_extension_rejected(self, tmp_path):
+        """Test that an explicit format that does not match the file extension raises a ValueError."""
+        with pytest.raises(ValueError):
+            export_batch_results(_RESULTS, "simple", str(tmp_path / "out_results.csv"), results_format="parquet")
+        assert_that(list(tmp_path.iterdir())).is_empty()
+
+    def test_failed_write_leaves_no_file(self, tmp_path):
+        """Test that a write error does not leave an empty reserved file in the directory."""
+        with mock.patch.object(pd.DataFrame, "to_parquet", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                export_batch_results(_RESULTS, "simple", str(tmp_path))
+        assert_that(list(tmp_path.iterdir())).is_empty()
+
+    def test_unknown_format_rejected(self, tmp_path):
+        """Test that an unsupported format raises a ValueError."""
+        with pytest.raises(ValueError):
+            export_batch_results(_RESULTS, "simple", str(tmp_path), results_format="xlsx")
+
+
+def _random_bars(seed, num_bars=300):
+    """Create daily OHLCV bars following a random walk."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, num_bars))
+    return pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000.0},
+        index=pd.date_range("2020-01-01", periods=num_bars, freq="D"),
+    )
+
+
+class TestBacktestTickers:
+    """Test cases for the multi-ticker pipeline."""
+
+    def test_downloads_feed_the_workers(self):
+        """Test that the tickers are downloaded in one batch in this process and backtested from those bars."""
+        with mock.patch.object(
+            data_sources,
+            "get_yahoo_data_batch",
+            side_effect=lambda tickers, *args: {ticker: _to_feed(_random_bars(len(ticker)), "day") for ticker in tickers},
+        ) as download:
+            results = backtest_tickers(["A", "BB"], vectorized=True)
+
+        assert_that(download.call_count).is_equal_to(1)
+        assert_that(list(results)).is_equal_to(["A", "BB"])
+        assert_that(results["BB"]).is_equal_to(run_vector(_random_bars(2), simple_strategy_signals))
+
+    def test_download_errors_are_raised(self):
+        """Test that a failed download surfaces in the caller."""
+        with mock.patch.object(data_sources, "get_yahoo_data_batch", side_effect=RuntimeError("no data")):
+            with pytest.raises(RuntimeError):
+                backtest_tickers(["A", "BB"], vectorized=True)
+
+
+class TestMetrics:
+    """Test cases for choosing which metrics are computed."""
+
+    def test_only_requested_analyzers_are_registered(self):
+        """Test that the cerebro gets one analyzer per requested metric."""
+        cerebro = build_cerebro("simple", 10000.0, 0.0, analyzers=["trades", "sharpe"])
+
+        assert_that([kwargs["_name"] for _, _, kwargs in cerebro.analyzers]).is_equal_to(["sharpe", "trades"])
+
+    def test_unknown_metric_rejected(self):
+        """Test that a misspelled metric raises a ValueError."""
+        with pytest.raises(ValueError):
+            build_cerebro("simple", 10000.0, 0.0, analyzers=["sharp"])
+
+    @pytest.mark.parametrize("vectorized", [False, True])
+    def test_results_contain_requested_metrics(self, vectorized):
+        """Test that the results only hold the requested metrics, on both engines."""
+        with mock.patch("stonkwise.plotter.create_plot", return_value="plot.png"):
+            results = backtest_ticker("A", data=_random_bars(0), metrics={"returns"}, vectorized=vectorized)
+
+        assert_that(results).contains_only("initial_value", "final_value", "total_return", "annual_return")
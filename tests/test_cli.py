@@ -3,14 +3,17 @@ Tests for the CLI module.
 """
 
 import os
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
+from unittest import mock
 
 import pytest
 from assertpy import assert_that
 from click.testing import CliRunner
 
-from stonkwise.cli import cli
+from stonkwise.cli import cli, main
 
 
 class TestCLI:
@@ -27,6 +30,16 @@ class TestCLI:
         assert_that(result.exit_code).is_equal_to(0)
         assert_that(result.output).contains("0.1.0")
 
+    @pytest.mark.parametrize("flag", ["-v", "--version"])
+    def test_main_version_fast_path(self, flag, capsys, monkeypatch):
+        """Test that main answers a bare version flag without running the Click group."""
+        monkeypatch.setattr(sys, "argv", ["stonkwise", flag])
+        with mock.patch("stonkwise._cli_impl.cli") as click_group:
+            assert_that(main()).is_equal_to(0)
+
+        click_group.assert_not_called()
+        assert_that(capsys.readouterr().out).is_equal_to("stonkwise, version 0.1.0\n")
+
     def test_cli_help(self, runner):
         """Test the CLI help option."""
         result = runner.invoke(cli, ["--help"])
@@ -49,6 +62,12 @@ class TestCLI:
         assert_that(result.output).contains("Error")
         assert_that(result.output).contains("ticker")
 
+    def test_analyze_invalid_date(self, runner):
+        """Test that a malformed date is rejected while parsing the options."""
+        result = runner.invoke(cli, ["analyze", "--ticker", "MSFT", "--start-date", "2024-13-01"])
+        assert_that(result.exit_code).is_not_equal_to(0)
+        assert_that(result.output).contains("YYYY-MM-DD")
+
     @pytest.mark.skip(reason="Requires network access to Yahoo Finance")
     def test_analyze_with_ticker(self, runner):
         """Test the analyze command with a ticker."""
@@ -114,3 +133,28 @@ class TestCLI:
         assert_that(result.output).contains("Detected")
         assert_that(result.output).contains("supply zones")
         assert_that(result.output).contains("demand zones")
+
+
+class TestImportIsolation:
+    """Test that the CLI startup path does not load the heavy dependencies."""
+
+    @pytest.mark.parametrize(
+        "module", ["stonkwise.cli", "stonkwise._cli_impl", "stonkwise.analyzer", "stonkwise.backtester", "stonkwise.data_sources", "stonkwise.utils"]
+    )
+    def test_heavy_modules_not_imported(self, module):
+        """Test that importing the module does not import backtrader, yfinance, pandas, matplotlib or NumPy."""
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True)
+
+        # Lines look like "import time:  self [us] | cumulative | module"
+        imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+        assert_that(imported).contains(module)
+        assert_that(imported).does_not_contain("backtrader", "yfinance", "pandas", "matplotlib", "numpy")
+
+    def test_version_does_not_import_click(self):
+        """Test that the --version fast path exits before Click is imported."""
+        code = "import sys; sys.argv = ['stonkwise', '--version']; from stonkwise.cli import main; main()"
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+
+        imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+        assert_that(result.stdout).is_equal_to("stonkwise, version 0.1.0\n")
+        assert_that(imported).does_not_contain("click")
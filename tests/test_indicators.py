@@ -0,0 +1,58 @@
+"""
+Tests for the custom indicators module.
+"""
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+
+from stonkwise.indicators import FastSMA
+
+
+class _BothSMAs(bt.Strategy):
+    """Strategy that only computes the built-in SMA and FastSMA side by side."""
+
+    def __init__(self):
+        self.builtin = bt.indicators.SimpleMovingAverage(self.data.close, period=20)
+        self.fast = FastSMA(self.data.close, period=20)
+
+
+class TestFastSMA:
+    """Test cases for the FastSMA indicator."""
+
+    @pytest.mark.parametrize("runonce", [True, False])
+    def test_matches_builtin_sma(self, runonce):
+        """Test that FastSMA matches backtrader's SMA in both run modes."""
+        rng = np.random.default_rng(0)
+        close = 100 + np.cumsum(rng.normal(0, 1, 300))
+        df = pd.DataFrame(
+            {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000.0},
+            index=pd.date_range("2020-01-01", periods=300, freq="D"),
+        )
+
+        cerebro = bt.Cerebro(runonce=runonce)
+        cerebro.adddata(bt.feeds.PandasData(dataname=df, datetime=None, openinterest=-1))
+        cerebro.addstrategy(_BothSMAs)
+        strat = cerebro.run()[0]
+
+        np.testing.assert_allclose(np.array(strat.fast.sma.array), np.array(strat.builtin.sma.array), rtol=1e-12, equal_nan=True)
+
+    @pytest.mark.parametrize("runonce", [True, False])
+    def test_recovers_after_nan_bar(self, runonce):
+        """Test that a NaN close only affects the windows that contain it, like backtrader's SMA."""
+        close = np.arange(1.0, 61.0)
+        close[30] = np.nan
+        df = pd.DataFrame(
+            {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000.0},
+            index=pd.date_range("2020-01-01", periods=60, freq="D"),
+        )
+
+        cerebro = bt.Cerebro(runonce=runonce)
+        cerebro.adddata(bt.feeds.PandasData(dataname=df, datetime=None, openinterest=-1))
+        cerebro.addstrategy(_BothSMAs)
+        strat = cerebro.run()[0]
+
+        fast = np.array(strat.fast.sma.array)
+        np.testing.assert_allclose(fast, np.array(strat.builtin.sma.array), rtol=1e-12, equal_nan=True)
+        np.testing.assert_allclose(fast[-1], 50.5)
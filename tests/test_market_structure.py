@@ -2,14 +2,17 @@
 Tests for the market structure detection module.
 """
 
+import logging
 from datetime import datetime, timedelta
+from unittest import mock
 
 import numpy as np
 import pandas as pd
 import pytest
 from assertpy import assert_that
 
-from stonkwise.market_structure import MarketStructureDetector, TrendType
+from stonkwise.market_structure import MarketStructureDetector, TrendType, get_supply_demand_zones
+from stonkwise.ohlcv import OHLCV
 
 
 class TestMarketStructureDetector:
@@ -208,6 +211,22 @@ class TestMarketStructureDetector:
         # Assert that the trend is unknown due to insufficient swings
         assert_that(trend).is_equal_to(TrendType.UNKNOWN)
 
+    @pytest.mark.parametrize("num_bars", [5, 15, 200])
+    def test_wilder_atr(self, num_bars):
+        """Test that the opt-in Wilder ATR seeds with a mean and then smooths recursively."""
+        rng = np.random.default_rng(3)
+        close = 100 + np.cumsum(rng.normal(0, 1, num_bars))
+        high = close + rng.uniform(0, 2, num_bars)
+        low = close - rng.uniform(0, 2, num_bars)
+
+        true_range = np.maximum(np.maximum(high[1:] - low[1:], np.abs(high[1:] - close[:-1])), np.abs(low[1:] - close[:-1]))
+        expected = true_range[:14].mean()
+        for value in true_range[14:]:
+            expected = (expected * 13 + value) / 14
+
+        detector = MarketStructureDetector(wilder_atr=True)
+        assert_that(detector._calculate_atr_arrays(high, low, close, period=14)).is_close_to(expected, 1e-9)
+
     def test_real_world_data(self):
         """Test with a more realistic price pattern."""
         # Create a dataframe with a more realistic price pattern
@@ -256,3 +275,133 @@ class TestMarketStructureDetector:
 
         # We don't assert a specific trend here, just that it's not unknown
         assert_that(trend).is_not_equal_to(TrendType.UNKNOWN)
+
+
+class TestSharedDetectors:
+    """Test cases for the cached detector factory and the module-level helpers."""
+
+    @staticmethod
+    def _wave(slope: float) -> pd.DataFrame:
+        """Create a zig-zag price series drifting by ``slope`` per bar."""
+        steps = np.arange(60, dtype=np.float64)
+        closes = 100 + slope * steps + 5 * np.sin(steps / 2)
+        return pd.DataFrame(
+            {
+                "Open": closes,
+                "High": closes + 1,
+                "Low": closes - 1,
+                "Close": closes,
+                "Volume": np.full(60, 1000000),
+            },
+            index=pd.date_range("2024-01-01", periods=60, freq="D"),
+        )
+
+    def test_get_returns_cached_instance(self):
+        """Test that the factory reuses one detector per parameter combination."""
+        assert_that(MarketStructureDetector.get(3, 0.5, 0.66)).is_same_as(MarketStructureDetector.get(3, 0.5, 0.66))
+        assert_that(MarketStructureDetector.get(3, 0.5, 0.66)).is_not_same_as(MarketStructureDetector.get(4, 0.5, 0.66))
+
+    def test_module_zones_do_not_reuse_previous_trend(self):
+        """Test that the shared detector re-detects the structure for new data."""
+        uptrend, downtrend = self._wave(1.0), self._wave(-1.0)
+
+        get_supply_demand_zones(uptrend, swing_lookback=2, atr_swing_threshold_multiplier=0.1)
+        zones = get_supply_demand_zones(downtrend, swing_lookback=2, atr_swing_threshold_multiplier=0.1)
+
+        expected = MarketStructureDetector(swing_lookback=2, atr_swing_threshold_multiplier=0.1).get_supply_demand_zones(downtrend)
+        assert_that(zones).is_equal_to(expected)
+
+    def test_ohlcv_input_matches_dataframe(self):
+        """Test that the detector gives the same results for OHLCV arrays and a DataFrame."""
+        data = self._wave(1.0)
+        from_frame = MarketStructureDetector(swing_lookback=2, atr_swing_threshold_multiplier=0.1)
+        from_arrays = MarketStructureDetector(swing_lookback=2, atr_swing_threshold_multiplier=0.1)
+
+        assert_that(from_arrays.detect_structure(OHLCV.from_dataframe(data))).is_equal_to(from_frame.detect_structure(data))
+        assert_that(from_arrays.swing_highs).is_equal_to(from_frame.swing_highs)
+        assert_that(from_arrays.get_supply_demand_zones(OHLCV.from_dataframe(data))).is_equal_to(from_frame.get_supply_demand_zones(data))
+
+    def test_repeated_detection_is_memoized(self):
+        """Test that the same prices are not analyzed twice, but changed prices are."""
+        detector = MarketStructureDetector(swing_lookback=2, atr_swing_threshold_multiplier=0.1)
+        uptrend = self._wave(1.0)
+        trend = detector.detect_structure(uptrend)
+
+        with mock.patch.object(detector, "_detect_swings", wraps=detector._detect_swings) as detect_swings:
+            assert_that(detector.detect_structure(uptrend.copy())).is_equal_to(trend)
+            assert_that(detect_swings.call_count).is_equal_to(0)
+
+            detector.detect_structure(self._wave(-1.0))
+            assert_that(detect_swings.call_count).is_equal_to(1)
+
+    def test_diagnostics_are_debug_logs(self, caplog, capsys):
+        """Test that detection reports its diagnostics through logging rather than stdout."""
+        detector = MarketStructureDetector(swing_lookback=2, atr_swing_threshold_multiplier=0.1)
+        with caplog.at_level(logging.DEBUG, logger="stonkwise.market_structure"):
+            detector.detect_structure(self._wave(1.0))
+
+        assert_that(caplog.text).contains("swing highs")
+        assert_that(capsys.readouterr().out).is_empty()
+
+    def test_zones_reuse_structure_atr(self):
+        """Test that building zones from the data just analyzed does not calculate the ATR again."""
+        detector = MarketStructureDetector(swing_lookback=2, atr_swing_threshold_multiplier=0.1)
+        uptrend = self._wave(1.0)
+
+        with mock.patch.object(detector, "_calculate_atr_arrays", wraps=detector._calculate_atr_arrays) as calculate_atr:
+            detector.detect_structure(uptrend)
+            detector.get_supply_demand_zones(uptrend)
+            assert_that(calculate_atr.call_count).is_equal_to(1)
+
+            detector.get_supply_demand_zones(uptrend.iloc[:-1])
+            assert_that(calculate_atr.call_count).is_equal_to(2)
+
+    def test_atr_follows_in_place_edits(self):
+        """Test that editing the analyzed frame in place recalculates the ATR."""
+        detector = MarketStructureDetector(swing_lookback=2, atr_swing_threshold_multiplier=0.1)
+        data = self._wave(1.0)
+        detector.detect_structure(data)
+
+        data.loc[data.index[-5], "High"] += 50.0
+        detector.detect_structure(data)
+
+        expected = MarketStructureDetector()._calculate_atr(data.copy())
+        assert_that(detector._calculate_atr(data)).is_equal_to(expected)
+
+    @pytest.mark.parametrize("lookback", [1, 2, 5])
+    def test_fused_swing_kernel_matches_rolling_path(self, lookback):
+        """Test that the fused swing kernel finds the same swings as the rolling-window fallback."""
+        rng = np.random.default_rng(7)
+        closes = 100 + np.cumsum(rng.normal(0, 1, 500))
+        highs = closes + rng.uniform(0, 2, 500)
+        highs[100] = np.nan  # windows containing NaN never hold a swing
+        data = pd.DataFrame(
+            {"Open": closes, "High": highs, "Low": closes - rng.uniform(0, 2, 500), "Close": closes, "Volume": np.full(500, 1000000)},
+            index=pd.date_range("2024-01-01", periods=500, freq="D"),
+        )
+
+        fused = MarketStructureDetector(swing_lookback=lookback, atr_swing_threshold_multiplier=0.5)
+        fused.detect_structure(data)
+        with mock.patch("stonkwise.market_structure.NUMBA_AVAILABLE", False):
+            rolling = MarketStructureDetector(swing_lookback=lookback, atr_swing_threshold_multiplier=0.5)
+            rolling.detect_structure(data)
+
+        assert_that(fused.swing_highs).is_equal_to(rolling.swing_highs)
+        assert_that(fused.swing_lows).is_equal_to(rolling.swing_lows)
+
+    @pytest.mark.parametrize("numba_available", [True, False])
+    def test_batch_matches_per_symbol_detection(self, numba_available):
+        """Test that batch detection gives each symbol the trend of a separate detection."""
+        data_by_symbol = {"UP": self._wave(1.0), "DOWN": self._wave(-1.0), "FLAT": self._wave(0.0), "SHORT": self._wave(1.0).iloc[:4]}
+        detector = MarketStructureDetector(swing_lookback=2, atr_swing_threshold_multiplier=0.1)
+
+        with mock.patch("stonkwise.market_structure.NUMBA_AVAILABLE", numba_available):
+            trends = detector.detect_structure_batch(data_by_symbol)
+
+        expected = {
+            symbol: MarketStructureDetector(swing_lookback=2, atr_swing_threshold_multiplier=0.1).detect_structure(data)
+            for symbol, data in data_by_symbol.items()
+        }
+        assert_that(trends).is_equal_to(expected)
+        assert_that(list(trends)).is_equal_to(list(data_by_symbol))
+        assert_that(trends["SHORT"]).is_equal_to(TrendType.UNKNOWN)
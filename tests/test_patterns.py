@@ -2,13 +2,27 @@
 Tests for the candlestick pattern detection module.
 """
 
+import gc
+import weakref
 from datetime import datetime, timedelta
+from unittest import mock
 
+import numpy as np
 import pandas as pd
 import pytest
 from assertpy import assert_that
 
-from stonkwise.patterns import CandlestickPattern, PatternDetector, detect_bearish_engulfing, detect_bullish_engulfing, scan_for_patterns
+from stonkwise.ohlcv import OHLCV
+from stonkwise.patterns import (
+    CandlestickPattern,
+    PatternDetector,
+    compute_engulfing_score,
+    compute_hammer_score,
+    compute_shooting_star_score,
+    detect_bearish_engulfing,
+    detect_bullish_engulfing,
+    scan_for_patterns,
+)
 
 
 class TestPatternDetector:
@@ -224,6 +238,145 @@ class TestPatternDetector:
                 assert_that(occurrence).is_instance_of(tuple)
                 assert_that(occurrence).is_length(2)  # (index, timestamp)
 
+    def test_engulfing_masks_match_single_index_detection(self, detector):
+        """Test that the vectorized engulfing masks agree with the per-index methods."""
+        data = pd.DataFrame(
+            {
+                "Open": [100.0, 100.5, 99.0, 101.0, 100.0, 102.0, 100.0, 99.5, 101.0, 100.0],
+                "High": [101.0, 101.0, 102.0, 101.5, 100.2, 102.5, 103.0, 100.0, 101.5, 101.0],
+                "Low": [99.0, 99.5, 98.5, 98.0, 97.0, 101.5, 99.8, 98.0, 98.5, 99.0],
+                "Close": [100.5, 99.5, 101.5, 98.5, 99.8, 101.8, 100.2, 98.2, 98.8, 100.5],
+            }
+        )
+
+        bullish = detector.bullish_engulfing_mask(data)
+        bearish = detector.bearish_engulfing_mask(data)
+
+        assert_that(bullish.tolist()).is_equal_to([detector.detect_bullish_engulfing(data, i) for i in range(len(data))])
+        assert_that(bearish.tolist()).is_equal_to([detector.detect_bearish_engulfing(data, i) for i in range(len(data))])
+        assert_that(bullish[2]).is_true()
+        assert_that(bearish[1]).is_true()
+
+    def test_hammer_and_shooting_star_masks_match_single_index_detection(self, detector):
+        """Test that the vectorized hammer and shooting star masks agree with the per-index methods."""
+        data = pd.DataFrame(
+            {
+                "Open": [100.0, 100.0, 100.0, 100.0, 100.0, 100.0],
+                "High": [100.2, 103.0, 102.0, 100.0, 101.0, 100.1],
+                "Low": [97.0, 99.9, 98.0, 100.0, 99.0, 97.0],
+                "Close": [100.1, 100.1, 101.5, 100.0, 100.0, 100.1],
+            }
+        )
+
+        hammers = detector.hammer_mask(data)
+        stars = detector.shooting_star_mask(data)
+
+        assert_that(hammers.tolist()).is_equal_to([detector.detect_hammer(data, i) for i in range(len(data))])
+        assert_that(stars.tolist()).is_equal_to([detector.detect_shooting_star(data, i) for i in range(len(data))])
+        assert_that(hammers[0]).is_true()
+        assert_that(stars[1]).is_true()
+        assert_that(hammers[3] or stars[3]).is_false()
+
+    @pytest.mark.parametrize("min_body_size_ratio", [0.6, 0.8])
+    def test_compiled_masks_match_numpy_masks(self, min_body_size_ratio):
+        """Test that the compiled pattern kernels find the same candles as the NumPy conditions."""
+        rng = np.random.default_rng(5)
+        opens = np.round(100 + rng.normal(0, 1, 500), 1)
+        closes = np.round(opens + rng.normal(0, 1, 500), 1)
+        highs = np.maximum(opens, closes) + np.round(rng.exponential(1, 500) * (rng.random(500) < 0.7), 1)
+        lows = np.minimum(opens, closes) - np.round(rng.exponential(1, 500) * (rng.random(500) < 0.7), 1)
+        highs[::50] = lows[::50]  # flat candles
+        opens[7] = np.nan
+        data = pd.DataFrame({"Open": opens, "High": highs, "Low": lows, "Close": closes})
+        detector = PatternDetector(min_body_size_ratio=min_body_size_ratio)
+
+        with mock.patch("stonkwise.patterns.NUMBA_AVAILABLE", True):
+            compiled = detector.scan_patterns(data)
+        with mock.patch("stonkwise.patterns.NUMBA_AVAILABLE", False):
+            vectorized = detector.scan_patterns(data)
+
+        assert_that(compiled).is_equal_to(vectorized)
+        assert_that(compiled["hammer"]).is_not_empty()
+        assert_that(compiled["bullish_engulfing"]).is_not_empty()
+
+    def test_ohlcv_input_matches_dataframe(self, detector):
+        """Test that an OHLCV finds the same candles, with the same labels, as its DataFrame."""
+        rng = np.random.default_rng(11)
+        opens = np.round(100 + rng.normal(0, 1, 200), 1)
+        closes = np.round(opens + rng.normal(0, 1, 200), 1)
+        highs = np.maximum(opens, closes) + np.round(rng.exponential(1, 200), 1)
+        lows = np.minimum(opens, closes) - np.round(rng.exponential(1, 200), 1)
+        data = pd.DataFrame(
+            {"Open": opens, "High": highs, "Low": lows, "Close": closes, "Volume": np.full(200, 1000.0)},
+            index=pd.date_range("2024-01-01", periods=200, freq="D"),
+        )
+        bars = OHLCV.from_dataframe(data)
+
+        assert_that(detector.scan_patterns(bars)).is_equal_to(detector.scan_patterns(data))
+        assert_that([detector.detect_hammer(bars, i) for i in range(200)]).is_equal_to(detector.hammer_mask(data).tolist())
+        assert_that([detector.detect_bullish_engulfing(bars, i) for i in range(200)]).is_equal_to(detector.bullish_engulfing_mask(data).tolist())
+
+    def test_repeated_detection_uses_current_frame(self, detector):
+        """Test that each call reads the frame it is given, not one checked before."""
+        data = pd.DataFrame({"Open": [100.0, 100.0], "High": [100.2, 101.0], "Low": [97.0, 99.0], "Close": [100.1, 100.0]})
+        assert_that([detector.detect_hammer(data, i) for i in range(2)]).is_equal_to([True, False])
+
+        grown = pd.concat([data, pd.DataFrame({"Open": [100.0], "High": [100.2], "Low": [97.0], "Close": [100.1]})], ignore_index=True)
+        assert_that(detector.detect_hammer(grown, 2)).is_true()
+        assert_that(detector.detect_hammer(data.iloc[::-1].reset_index(drop=True), 0)).is_false()
+        assert_that(detector.detect_hammer(data, 0)).is_true()
+
+    def test_in_place_edits_of_float32_frame_are_seen(self, detector):
+        """Test that editing a float32 frame in place changes the answer of the next check."""
+        data = pd.DataFrame({"Open": [101.0, 99.0], "High": [102.0, 103.0], "Low": [98.0, 98.0], "Close": [99.5, 102.0]}, dtype=np.float32)
+        assert_that(detector.detect_bullish_engulfing(data, 1)).is_true()
+
+        data.loc[1, "Close"] = 98.5
+        assert_that(detector.detect_bullish_engulfing(data, 1)).is_false()
+        assert_that(detector.bullish_engulfing_mask(data)[1]).is_false()
+
+    def test_reassigned_columns_are_seen(self, detector):
+        """Test that replacing columns of a frame already checked changes the answer of the next check."""
+        data = pd.DataFrame({"Open": [10.0, 10.0], "High": [10.5, 10.5], "Low": [8.0, 8.0], "Close": [10.4, 10.4]})
+        assert_that([detector.detect_hammer(data, i) for i in range(2)]).is_equal_to([True, True])
+
+        data["Close"] = [9.0, 9.0]
+        data["Open"] = [10.4, 10.4]
+        assert_that(detector.detect_hammer(data, 0)).is_equal_to(PatternDetector().detect_hammer(data, 0)).is_false()
+
+    def test_bound_frame_matches_dataframe(self, detector):
+        """Test that per-index checks on a bound frame agree with checks on the DataFrame."""
+        rng = np.random.default_rng(3)
+        opens = np.round(100 + rng.normal(0, 1, 200), 1)
+        closes = np.round(opens + rng.normal(0, 1, 200), 1)
+        data = pd.DataFrame(
+            {
+                "Open": opens,
+                "High": np.maximum(opens, closes) + np.round(rng.exponential(1, 200), 1),
+                "Low": np.minimum(opens, closes) - np.round(rng.exponential(1, 200), 1),
+                "Close": closes,
+                "Volume": np.full(200, 1000.0),
+            },
+            index=pd.date_range("2024-01-01", periods=200, freq="D"),
+        )
+        bars = detector.bind(data)
+
+        assert_that(detector.bind(bars)).is_same_as(bars)
+        assert_that([detector.detect_hammer(bars, i) for i in range(200)]).is_equal_to([detector.detect_hammer(data, i) for i in range(200)])
+        assert_that([detector.detect_bearish_engulfing(bars, i) for i in range(200)]).is_equal_to(
+            [detector.detect_bearish_engulfing(data, i) for i in range(200)]
+        )
+
+    def test_default_detector_does_not_keep_frames_alive(self):
+        """Test that the shared detector behind the convenience functions only refers to frames weakly."""
+        data = pd.DataFrame({"Open": [101.0, 99.0], "High": [102.0, 103.0], "Low": [98.0, 98.0], "Close": [99.5, 102.0]})
+        detect_bullish_engulfing(data, 1)
+        frame_ref = weakref.ref(data)
+
+        del data
+        gc.collect()
+        assert_that(frame_ref()).is_none()
+
     def test_zero_range_candles(self, detector):
         """Test behavior with zero-range candles (all OHLC equal)."""
         data = pd.DataFrame(
@@ -289,6 +442,55 @@ class TestConvenienceFunctions:
         assert_that(results).contains_key("bullish_engulfing")
 
 
+class TestAnalyticScores:
+    """Test cases for the vectorized analytic pattern scores."""
+
+    def test_hammer_score_ranks_hammer_above_large_body(self):
+        """Test that a hammer candle scores higher than a large-body candle."""
+        # Candle 0 is a hammer, candle 1 has a large bearish body
+        scores = compute_hammer_score(np.array([100.0, 100.0]), np.array([100.2, 102.0]), np.array([97.0, 97.0]), np.array([99.8, 97.5]))
+
+        assert_that(scores[0]).is_greater_than(scores[1])
+
+    def test_shooting_star_score_ranks_star_above_large_body(self):
+        """Test that a shooting star candle scores higher than a large-body candle."""
+        # Candle 0 is a shooting star, candle 1 has a large bullish body
+        scores = compute_shooting_star_score(np.array([100.0, 100.0]), np.array([103.0, 103.0]), np.array([99.8, 99.8]), np.array([100.2, 102.5]))
+
+        assert_that(scores[0]).is_greater_than(scores[1])
+
+    def test_engulfing_score_sign_and_magnitude(self):
+        """Test that the engulfing score is signed by direction and zero for same-colour pairs."""
+        scores = compute_engulfing_score(np.array([100.5, 99.0, 101.0, 100.0]), np.array([99.5, 101.5, 98.5, 99.0]))
+
+        assert_that(scores[0]).is_equal_to(0.0)
+        assert_that(scores[1]).is_close_to(2.5, 1e-9)  # Bullish body 2.5x the previous bearish body
+        assert_that(scores[2]).is_close_to(-1.0, 1e-9)  # Bearish body equal to the previous bullish body
+        assert_that(scores[3]).is_equal_to(0.0)  # Two bearish candles
+
+    @pytest.mark.parametrize("numba_available", [True, False])
+    def test_hammer_score_threshold_replaces_ratio_rules(self, numba_available):
+        """Test that the opt-in score threshold selects hammers and shooting stars by their analytic scores."""
+        rng = np.random.default_rng(3)
+        opens = 100 + rng.normal(0, 1, 300)
+        closes = opens + rng.normal(0, 1, 300)
+        highs = np.maximum(opens, closes) + rng.exponential(1, 300)
+        lows = np.minimum(opens, closes) - rng.exponential(1, 300)
+        data = pd.DataFrame({"Open": opens, "High": highs, "Low": lows, "Close": closes})
+        detector = PatternDetector(hammer_score_threshold=3.0)
+
+        with mock.patch("stonkwise.patterns.NUMBA_AVAILABLE", numba_available):
+            results = detector.scan_patterns(data)
+            hammers = [detector.detect_hammer(data, i) for i in range(len(data))]
+
+        expected = np.flatnonzero(compute_hammer_score(opens, highs, lows, closes) > 3.0).tolist()
+        assert_that([i for i, _ in results["hammer"]]).is_equal_to(expected).is_not_empty()
+        assert_that(np.flatnonzero(hammers).tolist()).is_equal_to(expected)
+        stars = np.flatnonzero(compute_shooting_star_score(opens, highs, lows, closes) > 3.0).tolist()
+        assert_that([i for i, _ in results["shooting_star"]]).is_equal_to(stars)
+        assert_that(results["bullish_engulfing"]).is_equal_to(PatternDetector().scan_patterns(data)["bullish_engulfing"])
+
+
 class TestPatternDetectorCustomParameters:
     """Test PatternDetector with custom parameters."""
 
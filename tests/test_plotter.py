@@ -0,0 +1,147 @@
+"""
+Tests for the plotter's file loaders and plot_ticker.
+"""
+
+import subprocess
+import sys
+from unittest import mock
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+from assertpy import assert_that
+
+from stonkwise.market_structure import MarketStructureDetector, TrendType
+from stonkwise.plotter import load_csv_data, load_parquet_data, plot_ticker, plot_tickers
+
+
+def _write_csv(path):
+    """Write a small OHLCV CSV file in the layout load_csv_data expects."""
+    path.write_text(
+        "Date,Open,High,Low,Close,Volume\n"
+        "2024-01-02,100.0,101.0,99.0,100.5,1000\n"
+        "2024-01-03,100.5,102.0,100.0,101.5,1100\n"
+        "2024-01-04,101.5,103.0,101.0,102.5,1200\n"
+    )
+
+
+class TestLoadCsvData:
+    """Test cases for CSV loading and its Parquet sidecar."""
+
+    def test_parses_csv_into_pandas_feed(self, tmp_path):
+        """Test that the CSV is parsed into a datetime-indexed OHLCV frame."""
+        csv_path = tmp_path / "prices.csv"
+        _write_csv(csv_path)
+
+        df = load_csv_data(str(csv_path)).p.dataname
+
+        assert_that(list(df.columns)).is_equal_to(["Open", "High", "Low", "Close", "Volume"])
+        assert_that(df.index[0]).is_equal_to(pd.Timestamp("2024-01-02"))
+        assert_that(df["Close"].tolist()).is_equal_to([100.5, 101.5, 102.5])
+
+    def test_sidecar_is_written_and_reused(self, tmp_path):
+        """Test that the Parquet sidecar is created and serves the next load."""
+        csv_path = tmp_path / "prices.csv"
+        _write_csv(csv_path)
+
+        first = load_csv_data(str(csv_path)).p.dataname
+        assert_that((tmp_path / "prices.csv.parquet.cache").exists()).is_true()
+
+        second = load_csv_data(str(csv_path)).p.dataname
+        pd.testing.assert_frame_equal(second, first, check_freq=False)
+
+
+class TestLoadParquetData:
+    """Test cases for Parquet loading."""
+
+    def test_reads_only_ohlcv_columns(self, tmp_path):
+        """Test that extra columns are dropped and the datetime index is kept."""
+        index = pd.DatetimeIndex(["2024-01-02", "2024-01-03"], name="Date")
+        wide = pd.DataFrame(
+            {
+                "Symbol": ["X", "X"],
+                "Open": [1.0, 2.0],
+                "High": [1.5, 2.5],
+                "Low": [0.5, 1.5],
+                "Close": [1.2, 2.2],
+                "Volume": [10.0, 20.0],
+                "Note": ["a", "b"],
+            },
+            index=index,
+        )
+        parquet_path = tmp_path / "prices.parquet"
+        wide.to_parquet(parquet_path)
+
+        df = load_parquet_data(str(parquet_path)).p.dataname
+
+        assert_that(list(df.columns)).is_equal_to(["Open", "High", "Low", "Close", "Volume"])
+        assert_that(df.index[0]).is_equal_to(pd.Timestamp("2024-01-02"))
+        assert_that(df["Close"].tolist()).is_equal_to([1.2, 2.2])
+
+
+class TestImportIsolation:
+    """Test that importing the plotter does not load the plotting stack."""
+
+    def test_import_does_not_load_plotting_stack(self):
+        """Test that importing the plotter does not import backtrader or matplotlib."""
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import stonkwise.plotter"], capture_output=True, text=True, check=True)
+
+        # Lines look like "import time:  self [us] | cumulative | module"
+        imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+        assert_that(imported).contains("stonkwise.plotter")
+        assert_that(imported).does_not_contain("backtrader", "matplotlib", "yfinance")
+
+
+class TestPlotTicker:
+    """Test cases for plot_ticker's market structure analysis."""
+
+    def test_detection_sees_every_bar(self):
+        """Test that trend detection is given the feed's full price history without an extra cerebro run."""
+        close = np.linspace(100.0, 120.0, 60)
+        df = pd.DataFrame(
+            {"Open": close, "High": close + 1.0, "Low": close - 1.0, "Close": close, "Volume": np.full(60, 1000.0)},
+            index=pd.bdate_range("2024-01-02", periods=60),
+        )
+
+        with mock.patch.object(MarketStructureDetector, "detect_structure", autospec=True, return_value=TrendType.UPTREND) as detect, mock.patch(
+            "stonkwise.plotter.create_plot", return_value="plot.png"
+        ), mock.patch.object(bt.Cerebro, "run", autospec=True) as run:
+            plot_ticker("TEST", data=df, show_trend=True)
+
+        assert_that(run.call_count).is_equal_to(1)
+        analyzed = detect.call_args.args[1]
+        assert_that(len(analyzed)).is_equal_to(60)
+        assert_that(analyzed["Close"].tolist()).is_equal_to(close.tolist())
+        assert_that(analyzed.index[0]).is_equal_to(pd.Timestamp("2024-01-02"))
+
+    def test_trend_and_zones_share_one_detection(self):
+        """Test that showing both the trend and the zones detects the structure only once."""
+        close = 100.0 + 5.0 * np.sin(np.linspace(0.0, 12.0, 120))
+        df = pd.DataFrame(
+            {"Open": close, "High": close + 1.0, "Low": close - 1.0, "Close": close, "Volume": np.full(120, 1000.0)},
+            index=pd.bdate_range("2024-01-02", periods=120),
+        )
+
+        with mock.patch.object(
+            MarketStructureDetector, "_detect_swings", autospec=True, side_effect=MarketStructureDetector._detect_swings
+        ) as swings, mock.patch("stonkwise.plotter.create_plot", return_value="plot.png") as create_plot, mock.patch.object(
+            bt.Cerebro, "run", autospec=True
+        ):
+            plot_ticker("TEST", data=df, show_trend=True, show_zones=True)
+
+        assert_that(swings.call_count).is_equal_to(1)
+        assert_that(create_plot.call_args.kwargs["zones"]).contains_key("supply", "demand")
+
+
+class TestPlotTickers:
+    """Test cases for plotting several tickers."""
+
+    def test_plots_every_ticker_in_workers(self, tmp_path):
+        """Test that each ticker gets its own plot when plotted in parallel."""
+        csv_path = tmp_path / "prices.csv"
+        _write_csv(csv_path)
+
+        plot_tickers(["AAA", "BBB"], input_file=str(csv_path), output_path=str(tmp_path))
+
+        plots = sorted(path.name.split("_")[0] for path in tmp_path.glob("*_plot.png"))
+        assert_that(plots).is_equal_to(["AAA", "BBB"])
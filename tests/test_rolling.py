@@ -0,0 +1,38 @@
+"""
+Tests for the streaming rolling extrema.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from assertpy import assert_that
+
+from stonkwise import _rolling
+from stonkwise._rolling import fast_rolling_max, fast_rolling_min
+
+
+class TestFastRolling:
+    """Test cases for fast_rolling_max and fast_rolling_min."""
+
+    @pytest.fixture(params=[True, False], ids=["deque", "sliding-window"])
+    def numba_available(self, request, monkeypatch):
+        """Run a test with both the compiled deque path and the sliding-window fallback."""
+        monkeypatch.setattr(_rolling, "NUMBA_AVAILABLE", request.param)
+        return request.param
+
+    @pytest.mark.parametrize("window", [1, 2, 5, 11])
+    def test_matches_pandas_rolling(self, window, numba_available):
+        """Test that both paths match pandas, including ties and NaN windows."""
+        rng = np.random.default_rng(window)
+        values = rng.integers(0, 6, 200).astype(np.float64)  # small range to force ties
+        values[rng.random(200) < 0.05] = np.nan
+
+        series = pd.Series(values).rolling(window)
+        np.testing.assert_array_equal(fast_rolling_max(values, window), series.max().to_numpy())
+        np.testing.assert_array_equal(fast_rolling_min(values, window), series.min().to_numpy())
+
+    def test_window_longer_than_input(self, numba_available):
+        """Test that a window longer than the input gives all NaN."""
+        result = fast_rolling_max(np.array([1.0, 2.0, 3.0]), 5)
+
+        assert_that(np.isnan(result).all()).is_true()
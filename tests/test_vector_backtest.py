@@ -0,0 +1,81 @@
+"""
+Tests for the vectorized backtesting module.
+"""
+
+from functools import partial
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+from assertpy import assert_that
+
+from stonkwise.utils.runner import build_cerebro
+from stonkwise.vector_backtest import run_vector, simple_strategy_signals, sma, sweep_sma_crossover
+
+
+def _random_walk(seed, num_bars=1000):
+    """Create an OHLCV frame following a random walk, long enough for several SMA crosses."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, num_bars))
+    open_ = close + rng.normal(0, 0.5, num_bars)
+    return pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) + 0.5,
+            "Low": np.minimum(open_, close) - 0.5,
+            "Close": close,
+            "Volume": np.full(num_bars, 1000.0),
+        },
+        index=pd.date_range("2020-01-01", periods=num_bars, freq="D"),
+    )
+
+
+class TestVectorBacktest:
+    """Test cases for the vectorized backtest."""
+
+    def test_sma_matches_pandas(self):
+        """Test that the SMA is NaN until the window is full and matches pandas after."""
+        values = np.arange(10, dtype=np.float64)
+        expected = pd.Series(values).rolling(3).mean().to_numpy()
+
+        np.testing.assert_allclose(sma(values, 3), expected)
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_simple_strategy_matches_backtrader(self, seed):
+        """Test that the vectorized SimpleStrategy reproduces the backtrader run."""
+        df = _random_walk(seed)
+
+        cerebro = build_cerebro("simple", 10000.0, 0.001)
+        cerebro.adddata(bt.feeds.PandasData(dataname=df, datetime=None, openinterest=-1))
+        strat = cerebro.run()[0]
+        trades = strat.analyzers.trades.get_analysis()
+
+        results = run_vector(df, simple_strategy_signals, initial_cash=10000.0, commission=0.001)
+
+        assert_that(results["final_value"]).is_close_to(cerebro.broker.getvalue(), 1e-6)
+        assert_that(results["total_return"]).is_close_to(strat.analyzers.returns.get_analysis()["rtot"], 1e-9)
+        assert_that(results["max_drawdown"]).is_close_to(strat.analyzers.drawdown.get_analysis()["max"]["drawdown"], 1e-6)
+        assert_that(results["total_trades"]).is_equal_to(trades.get("total", {}).get("total", 0))
+        assert_that(results["won_trades"]).is_equal_to(trades.get("won", {}).get("total", 0))
+
+    def test_no_signals_keeps_cash(self):
+        """Test that a strategy without signals leaves the portfolio untouched."""
+        df = _random_walk(0, num_bars=50)
+
+        results = run_vector(df, lambda frame: np.zeros(len(frame), dtype=np.int8))
+
+        assert_that(results["final_value"]).is_equal_to(10000.0)
+        assert_that(results["total_trades"]).is_equal_to(0)
+        assert_that(results["max_drawdown"]).is_equal_to(0.0)
+
+    def test_sweep_matches_single_runs(self):
+        """Test that every cell of a parameter sweep matches the corresponding single backtest."""
+        df = _random_walk(1)
+
+        sweep = sweep_sma_crossover(df, [20, 50], [100, 200])
+
+        assert_that(sweep).is_length(4)
+        for row in sweep.itertuples():
+            signals = partial(simple_strategy_signals, fast_period=row.fast_period, slow_period=row.slow_period)
+            assert_that(row.final_value).is_close_to(run_vector(df, signals)["final_value"], 1e-6)
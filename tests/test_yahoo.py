@@ -0,0 +1,160 @@
+"""
+Tests for the Yahoo Finance data source.
+"""
+
+import datetime
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+from assertpy import assert_that
+
+from stonkwise.data_sources import yahoo
+
+
+def _sample_download(*args, **kwargs):
+    """Return a small OHLCV frame shaped like a single-ticker yfinance download."""
+    index = pd.date_range("2024-01-01", periods=3, freq="D", name="Date")
+    return pd.DataFrame(
+        {
+            "Open": [100.0, 101.0, 102.0],
+            "High": [101.0, 102.0, 103.0],
+            "Low": [99.0, 100.0, 101.0],
+            "Close": [100.5, 101.5, 102.5],
+            "Volume": [1000, 1100, 1200],
+        },
+        index=index,
+    )
+
+
+class TestYahooCache:
+    """Test cases for the Parquet download cache."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        """Point the cache at a temporary directory."""
+        monkeypatch.setenv("STONKWISE_CACHE_DIR", str(tmp_path))
+        return tmp_path
+
+    def test_repeated_call_uses_cache(self, cache_dir):
+        """Test that the second identical request is served from disk."""
+        with mock.patch("yfinance.download", side_effect=_sample_download) as download:
+            first = yahoo.get_yahoo_data("MSFT", "2024-01-01", "2024-01-04")
+            second = yahoo.get_yahoo_data("MSFT", "2024-01-01", "2024-01-04")
+
+        assert_that(download.call_count).is_equal_to(1)
+        assert_that(list(cache_dir.glob("*.parquet"))).is_length(1)
+        pd.testing.assert_frame_equal(second.p.dataname, first.p.dataname, check_freq=False)
+
+    def test_requests_differing_in_time_of_day_are_cached_separately(self, cache_dir):
+        """Test that two requests on the same day with different times do not share a cache entry."""
+        with mock.patch("yfinance.download", side_effect=_sample_download) as download:
+            yahoo.get_yahoo_data("MSFT", datetime.datetime(2024, 1, 1, 9, 30), datetime.datetime(2024, 1, 4, 12))
+            yahoo.get_yahoo_data("MSFT", datetime.datetime(2024, 1, 1, 14), datetime.datetime(2024, 1, 4, 16))
+
+        assert_that(download.call_count).is_equal_to(2)
+        assert_that(list(cache_dir.glob("*.parquet"))).is_length(2)
+
+    def test_force_refresh_downloads_again(self):
+        """Test that force_refresh bypasses the cache."""
+        with mock.patch("yfinance.download", side_effect=_sample_download) as download:
+            yahoo.get_yahoo_data("MSFT", "2024-01-01", "2024-01-04")
+            yahoo.get_yahoo_data("MSFT", "2024-01-01", "2024-01-04", force_refresh=True)
+
+        assert_that(download.call_count).is_equal_to(2)
+
+    def test_empty_download_is_not_cached(self, cache_dir):
+        """Test that failed (empty) downloads are not written to the cache."""
+        with mock.patch("yfinance.download", return_value=pd.DataFrame()):
+            yahoo.get_yahoo_data("NOPE", "2024-01-01", "2024-01-04")
+
+        assert_that(list(cache_dir.glob("*.parquet"))).is_empty()
+
+    def test_no_cache_env_bypasses_cache(self, cache_dir, monkeypatch):
+        """Test that STONKWISE_NO_CACHE disables both cache reads and writes."""
+        monkeypatch.setenv("STONKWISE_NO_CACHE", "1")
+        with mock.patch("yfinance.download", side_effect=_sample_download) as download:
+            yahoo.get_yahoo_data("MSFT", "2024-01-01", "2024-01-04")
+            yahoo.get_yahoo_data("MSFT", "2024-01-01", "2024-01-04")
+
+        assert_that(download.call_count).is_equal_to(2)
+        assert_that(list(cache_dir.glob("*.parquet"))).is_empty()
+
+    def test_open_ended_range_is_not_cached(self, cache_dir):
+        """Test that a range reaching past today is downloaded again, since it can still gain bars."""
+        end_date = datetime.date.today() + datetime.timedelta(days=1)
+        with mock.patch("yfinance.download", side_effect=_sample_download) as download:
+            yahoo.get_yahoo_data("MSFT", "2024-01-01", end_date.isoformat())
+            yahoo.get_yahoo_data("MSFT", "2024-01-01", end_date.isoformat())
+
+        assert_that(download.call_count).is_equal_to(2)
+        assert_that(list(cache_dir.glob("*.parquet"))).is_empty()
+
+    def test_batch_downloads_only_uncached_tickers(self, cache_dir):
+        """Test that the batched download shares the cache with single-ticker requests."""
+        with mock.patch("yfinance.download", side_effect=_sample_download):
+            yahoo.get_yahoo_data("MSFT", "2024-01-01", "2024-01-04")
+
+        with mock.patch("yfinance.download", side_effect=_sample_download) as download:
+            feeds = yahoo.get_yahoo_data_batch(["MSFT", "AMZN"], "2024-01-01", "2024-01-04")
+
+        assert_that(download.call_args.kwargs["tickers"]).is_equal_to(["AMZN"])
+        assert_that(feeds).contains_only("MSFT", "AMZN")
+        assert_that(list(cache_dir.glob("*.parquet"))).is_length(2)
+
+    def test_cache_reads_are_kept_in_memory(self):
+        """Test that repeated cache hits in one process read the Parquet file once."""
+        with mock.patch("yfinance.download", side_effect=_sample_download):
+            yahoo.get_yahoo_data("MSFT", "2024-01-01", "2024-01-04")
+
+        with mock.patch("pandas.read_parquet", wraps=pd.read_parquet) as read_parquet:
+            first = yahoo.get_yahoo_data("MSFT", "2024-01-01", "2024-01-04")
+            second = yahoo.get_yahoo_data("MSFT", "2024-01-01", "2024-01-04")
+
+        assert_that(read_parquet.call_count).is_equal_to(1)
+        assert_that(second.p.dataname).is_same_as(first.p.dataname)
+
+
+class TestPrepareFrame:
+    """Test cases for extracting one ticker from a yfinance download."""
+
+    @staticmethod
+    def _grouped_download(symbols):
+        """Return a download shaped like yfinance's group_by="ticker" output for several symbols."""
+        single = _sample_download()
+        return pd.concat({symbol: single + offset for offset, symbol in enumerate(symbols)}, axis=1)
+
+    def test_ticker_is_matched_case_insensitively(self):
+        """Test that a lower-case ticker finds the upper-case symbol Yahoo returns."""
+        data_df = yahoo._prepare_frame(self._grouped_download(["MSFT", "AMZN"]), "msft", "day")
+
+        assert_that(list(data_df.columns)).is_equal_to(["Open", "High", "Low", "Close", "Volume"])
+        assert_that(data_df["Close"].tolist()).is_equal_to([100.5, 101.5, 102.5])
+
+    def test_missing_ticker_gives_no_bars(self, tmp_path, monkeypatch):
+        """Test that a ticker absent from a multi-ticker download is neither merged with the others nor cached."""
+        monkeypatch.setenv("STONKWISE_CACHE_DIR", str(tmp_path))
+        with mock.patch("yfinance.download", return_value=self._grouped_download(["AMZN", "GOOG"])):
+            feeds = yahoo.get_yahoo_data_batch(["AMZN", "NOPE"], "2024-01-01", "2024-01-04")
+
+        assert_that(list(feeds["NOPE"].p.dataname.columns)).is_equal_to(["Open", "High", "Low", "Close", "Volume"])
+        assert_that(feeds["NOPE"].p.dataname).is_empty()
+        assert_that(list(tmp_path.glob("*.parquet"))).is_length(1)
+
+
+class TestResample4h:
+    """Test cases for aggregating hourly bars into 4-hour bars."""
+
+    @pytest.mark.parametrize("tz", [None, "America/New_York"])
+    def test_matches_pandas_resample(self, tz):
+        """Test that the bucketed aggregation gives the same bars as DataFrame.resample, across a DST change."""
+        rng = np.random.default_rng(0)
+        index = pd.date_range("2024-03-01 09:00", periods=24 * 30, freq="h", tz=tz, name="Datetime")
+        index = index[(index.hour >= 9) & (index.hour <= 16) & (index.dayofweek < 5)]
+        df = pd.DataFrame(rng.random((len(index), 5)) * 100, index=index, columns=["Open", "High", "Low", "Close", "Volume"])
+        df.iloc[3, 0] = np.nan
+
+        expected = df.resample("4h").agg({"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}).dropna()
+
+        pd.testing.assert_frame_equal(yahoo._resample_4h(df), expected, check_freq=False, check_index_type=False)